@@ -11,6 +11,7 @@ Key Features:
 - CORS support for cross-origin requests
 - Swagger documentation
 - Error handling and logging
+- Gzip compression of JSON responses
 - Integration with multiple microservices
 
 Endpoints:
@@ -38,9 +39,12 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Import microservices and utilities
-from backend.core.utils import setup_logger
+from backend.core.utils import setup_logger, configure_logging
 from backend.core.config import Config
 
+# Configure the root logger before the routes import the services, which log as they load
+configure_logging()
+
 from backend.api_gateway.routes.news import news_ns
 from backend.api_gateway.routes.auth import auth_ns
 from backend.api_gateway.routes.health import health_ns
@@ -48,6 +52,7 @@ from backend.api_gateway.routes.summarize import summarize_ns
 from backend.api_gateway.routes.user import user_ns
 from backend.api_gateway.routes.bookmark import bookmark_ns
 from backend.api_gateway.routes.story_tracking import story_tracking_ns
+from backend.api_gateway.utils.compression import gzip_response
 
 # Initialize logger for the API Gateway
 logger = setup_logger(__name__)
@@ -66,6 +71,10 @@ CORS(app,
      methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"])
 logger.info(f"CORS configured with allowed origins: {Config.CORS_ORIGINS}")
 
+# Compress JSON responses for clients that accept gzip
+app.after_request(gzip_response)
+logger.info("Gzip response compression enabled")
+
 # Initialize Flask-RestX for API documentation
 api = Api(app, version='1.0', title='News Aggregator API',
           description='A news aggregation and summarization API')
@@ -10,7 +10,7 @@ from flask import request
 from flask_restx import Resource, Namespace, fields
 from gotrue.errors import AuthApiError
 
-from backend.core.supabase_client import supabase
+from backend.core.supabase_client import supabase_auth
 from backend.core.utils import setup_logger
 
 logger = setup_logger(__name__)
@@ -47,7 +47,7 @@ class Signup(Resource):
 
         try:
             logger.info(f"Signup request for email: {email}")
-            response = supabase.auth.sign_up({'email': email, 'password': password})
+            response = supabase_auth.auth.sign_up({'email': email, 'password': password})
 
             if response.user is None:
                 # Supabase returns no error but no user when email confirmation
@@ -93,7 +93,7 @@ class Login(Resource):
 
         try:
             logger.info(f"Login attempt for email: {email}")
-            response = supabase.auth.sign_in_with_password(
+            response = supabase_auth.auth.sign_in_with_password(
                 {'email': email, 'password': password}
             )
             logger.info(f"Login successful for user: {response.user.id}")
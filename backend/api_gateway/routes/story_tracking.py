@@ -9,7 +9,7 @@ creating, retrieving, updating, and deleting tracked stories.
 # Standard library imports
 from flask import jsonify, request, make_response, g
 from flask_restx import Resource, Namespace
-from datetime import datetime
+from datetime import datetime, timezone
 import os
 
 # Import microservices and utilities
@@ -64,6 +64,8 @@ class StoryTracking(Resource):
             logger.info(f"Found {len(articles) if articles else 0} articles for keyword: '{keyword}'")
             
             
+            # Fallback publish time for articles without one, taken once for the whole batch
+            fetched_at = datetime.now(timezone.utc).isoformat()
             processed_articles = []
             for article in articles:
                 logger.debug(f"Processing article: {article.get('title', 'No title')}")
@@ -74,7 +76,7 @@ class StoryTracking(Resource):
                     'title': article.get('title'),
                     'url': article.get('url'),
                     'source': article.get('source', {}).get('name') if isinstance(article.get('source'), dict) else article.get('source'),
-                    'publishedAt': article.get('publishedAt', datetime.now().isoformat())
+                    'publishedAt': article.get('publishedAt', fetched_at)
                 })
 
             logger.info(f"Returning {len(processed_articles)} processed articles")
@@ -129,7 +131,7 @@ class StoryTracking(Resource):
             logger.info(f"Tracked story created with ID: {tracked_story['id'] if tracked_story else 'unknown'}")
             
             logger.debug(f"Getting full story details for story: {tracked_story['id']}")
-            story_with_articles = get_story_details(tracked_story['id'])
+            story_with_articles = get_story_details(tracked_story['id'], story=tracked_story)
             logger.info(f"Found {len(story_with_articles.get('articles', [])) if story_with_articles else 0} related articles")
             
             return make_response(jsonify({
@@ -16,6 +16,15 @@ class Config:
     # Redis Configuration
     REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
     REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
+    CACHE_TTL = int(os.getenv('CACHE_TTL', 60))  # Seconds to keep cached read results
+    ARTICLE_CONTENT_TTL = int(os.getenv('ARTICLE_CONTENT_TTL', 86400))  # Seconds to keep fetched article content
+    ARTICLE_CONTENT_FRESHNESS = int(os.getenv('ARTICLE_CONTENT_FRESHNESS', 3600))  # Seconds before cached content is revalidated
+    SUMMARY_CACHE_TTL = int(os.getenv('SUMMARY_CACHE_TTL', 604800))  # Seconds to keep generated summaries
+    STORY_REFRESH_COOLDOWN = int(os.getenv('STORY_REFRESH_COOLDOWN', 10))  # Minutes before a story is re-fetched
+    STORY_FETCH_DEBOUNCE = float(os.getenv('STORY_FETCH_DEBOUNCE', 2))  # Seconds to batch background fetches per keyword
+    POLLING_CONCURRENCY = int(os.getenv('POLLING_CONCURRENCY', 8))  # Stories refreshed in parallel
+    POLLING_INTERVAL = int(os.getenv('POLLING_INTERVAL', 5))  # Minimum minutes between polls of a story
+    POLLING_MAX_INTERVAL = int(os.getenv('POLLING_MAX_INTERVAL', 60))  # Backoff cap for quiet stories, in minutes
     
     # File paths relative to project root
     NEWS_DATA_DIR = BASE_DIR / 'data' / 'news'
@@ -24,11 +33,21 @@ class Config:
     # API Keys
     NEWS_API_KEY = os.getenv('NEWS_API_KEY')
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+    GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-2.0-flash-lite')  # Default summarization model
+    GEMINI_ESCALATION_MODEL = os.getenv('GEMINI_ESCALATION_MODEL', 'gemini-2.0-flash')  # Used when a summary fails the quality check
+    GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', 10))  # Summaries generated in parallel
+    GEMINI_RPM = int(os.getenv('GEMINI_RPM', 4000))  # Requests per minute allowed by the Gemini quota
+    GEMINI_TPM = int(os.getenv('GEMINI_TPM', 4000000))  # Tokens per minute allowed by the Gemini quota
 
     # Supabase Configuration
     SUPABASE_URL = os.getenv('SUPABASE_URL')
     SUPABASE_SERVICE_ROLE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
     SUPABASE_JWT_SECRET = os.getenv('SUPABASE_JWT_SECRET')
+    SUPABASE_TIMEOUT = float(os.getenv('SUPABASE_TIMEOUT', 10))
+    SUPABASE_CONNECT_TIMEOUT = float(os.getenv('SUPABASE_CONNECT_TIMEOUT', 2))
+    SUPABASE_MAX_CONNECTIONS = int(os.getenv('SUPABASE_MAX_CONNECTIONS', 20))
+    SUPABASE_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('SUPABASE_MAX_KEEPALIVE_CONNECTIONS', 10))
+    SUPABASE_KEEPALIVE_EXPIRY = float(os.getenv('SUPABASE_KEEPALIVE_EXPIRY', 30))  # Seconds an idle connection is kept
 
     # CORS Configuration
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*').split(',')
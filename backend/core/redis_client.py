@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Centralized Redis Cache Client
+
+Provides a single shared Redis client and small helpers for caching JSON-serializable
+read results with a TTL. Cache failures are logged and treated as misses, so Redis
+being unavailable never breaks a request; callers simply fall back to Supabase.
+
+Import pattern for all modules:
+    from backend.core.redis_client import cache_get, cache_set, cache_delete
+"""
+
+import logging
+import orjson
+import redis
+from backend.core.config import Config
+
+logger = logging.getLogger(__name__)
+
+redis_client = redis.Redis(
+    host=Config.REDIS_HOST,
+    port=Config.REDIS_PORT,
+    socket_connect_timeout=1,
+    socket_timeout=1
+)
+logger.info(f"Redis cache client configured for {Config.REDIS_HOST}:{Config.REDIS_PORT}")
+
+def cache_get(key, field=None):
+    """
+    Returns the cached value for a key, or None on a miss or cache error.
+
+    Args:
+        key (str): The cache key
+        field (str, optional): Field within the key's hash, for keys holding several
+            variants of the same data (e.g. different column projections)
+
+    Returns:
+        The deserialized cached value, or None
+    """
+    try:
+        cached = redis_client.get(key) if field is None else redis_client.hget(key, field)
+    except redis.RedisError as e:
+        logger.warning(f"Cache read failed for {key}: {str(e)}")
+        return None
+    return orjson.loads(cached) if cached is not None else None
+
+def cache_set(key, value, ttl=Config.CACHE_TTL, field=None):
+    """
+    Caches a JSON-serializable value under a key with a TTL.
+
+    Args:
+        key (str): The cache key
+        value: The value to cache
+        ttl (int, optional): Time to live in seconds. Defaults to Config.CACHE_TTL.
+        field (str, optional): Field within the key's hash to store the value under.
+            Deleting the key invalidates all of its fields at once. The TTL is set
+            when the hash is created and is not extended by later field writes, so
+            no field outlives it (EXPIRE NX, Redis 7.0+).
+    """
+    try:
+        if field is None:
+            redis_client.setex(key, ttl, orjson.dumps(value))
+        else:
+            pipe = redis_client.pipeline()
+            pipe.hset(key, field, orjson.dumps(value))
+            pipe.expire(key, ttl, nx=True)
+            pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Cache write failed for {key}: {str(e)}")
+
+def cache_delete(*keys):
+    """
+    Removes one or more keys from the cache.
+
+    Args:
+        *keys (str): The cache keys to invalidate
+    """
+    try:
+        redis_client.delete(*keys)
+    except redis.RedisError as e:
+        logger.warning(f"Cache invalidation failed for {keys}: {str(e)}")
@@ -3,13 +3,21 @@
 Centralized Supabase Client Singleton
 
 Provides a single shared Supabase client using the service role key,
-which bypasses RLS for all server-side operations.
+which bypasses RLS for all server-side operations. The client's PostgREST
+session uses a bounded, keep-alive connection pool so that every module
+reuses the same warm HTTP connections instead of opening new ones.
+
+User sign-up and sign-in go through a separate client, supabase_auth. Signing
+in on the shared client would make supabase-py rebuild its PostgREST client
+with the user's token, dropping both the service role and the pooled session.
 
 Import pattern for all modules:
     from backend.core.supabase_client import supabase
 """
 
-from supabase import create_client, Client
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+from supabase import create_client, Client, ClientOptions
 from backend.core.config import Config
 import logging
 
@@ -20,5 +28,65 @@ if not Config.SUPABASE_URL or not Config.SUPABASE_SERVICE_ROLE_KEY:
         "SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set in environment."
     )
 
-supabase: Client = create_client(Config.SUPABASE_URL, Config.SUPABASE_SERVICE_ROLE_KEY)
+supabase: Client = create_client(
+    Config.SUPABASE_URL,
+    Config.SUPABASE_SERVICE_ROLE_KEY,
+    options=ClientOptions(postgrest_client_timeout=Config.SUPABASE_TIMEOUT)
+)
+
+# Replace the default PostgREST session with one backed by a tuned connection pool,
+# keeping the base URL and headers (API key, schema) of the original session
+_default_session = supabase.postgrest.session
+supabase.postgrest.session = httpx.Client(
+    base_url=_default_session.base_url,
+    headers=_default_session.headers,
+    # Fail fast on connection setup while still allowing slow queries to finish
+    timeout=httpx.Timeout(Config.SUPABASE_TIMEOUT, connect=Config.SUPABASE_CONNECT_TIMEOUT),
+    limits=httpx.Limits(
+        max_connections=Config.SUPABASE_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.SUPABASE_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=Config.SUPABASE_KEEPALIVE_EXPIRY
+    ),
+    follow_redirects=True
+)
+_default_session.close()
+
 logger.info("Supabase singleton client initialized (service role)")
+
+# PostgREST encodes in_() filters in the request URL, so long value lists are split
+# to stay well below URL length limits
+IN_FILTER_CHUNK_SIZE = 100
+
+def select_in_chunks(table, columns, column, values, chunk_size=IN_FILTER_CHUNK_SIZE):
+    """
+    Selects the rows of a table whose column matches any of the given values.
+
+    The values are queried in chunks of chunk_size, run concurrently when there is
+    more than one, and the rows of all chunks are returned together.
+
+    Args:
+        table (str): The table to select from
+        columns (str): The columns to return, as passed to select()
+        column (str): The column to filter with in_()
+        values (list): The values to match
+        chunk_size (int, optional): Maximum number of values per query
+
+    Returns:
+        list: The matching rows
+    """
+    chunks = [values[i:i + chunk_size] for i in range(0, len(values), chunk_size)]
+
+    def fetch(chunk):
+        return supabase.table(table).select(columns).in_(column, chunk).execute().data or []
+
+    if len(chunks) <= 1:
+        return fetch(chunks[0]) if chunks else []
+    with ThreadPoolExecutor(max_workers=min(len(chunks), Config.SUPABASE_MAX_CONNECTIONS)) as executor:
+        return [row for rows in executor.map(fetch, chunks) for row in rows]
+
+# Client used only for user authentication calls; it keeps no session of its own
+supabase_auth: Client = create_client(
+    Config.SUPABASE_URL,
+    Config.SUPABASE_SERVICE_ROLE_KEY,
+    options=ClientOptions(auto_refresh_token=False, persist_session=False)
+)
@@ -1,15 +1,40 @@
+import atexit
 import logging
 import logging.config
+import logging.handlers
+import queue
 import traceback
 from functools import wraps
 from typing import Callable, Any
 from .config import Config
 
-# Configure logging based on settings from Config
-logging.basicConfig(
-    level=getattr(logging, Config.LOG_LEVEL),
-    format=Config.LOG_FORMAT
-)
+# Log records are handed to a queue and written to the console by a background
+# listener thread, so request threads never block on stream writes
+_log_queue = queue.SimpleQueue()
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(logging.Formatter(Config.LOG_FORMAT))
+_log_listener = logging.handlers.QueueListener(_log_queue, _console_handler, respect_handler_level=True)
+_log_listener.start()
+# Flush records still in the queue on interpreter exit
+atexit.register(_log_listener.stop)
+
+def configure_logging(level: str = Config.LOG_LEVEL, fmt: str = Config.LOG_FORMAT) -> None:
+    """
+    Routes the root logger through the shared queue and console listener.
+
+    Called once by each process entry point rather than on import, so an entry
+    point's own level and format are not overridden by whichever module happened
+    to import this one first. The format applies to every record the listener
+    writes, including those from setup_logger() loggers.
+    """
+    _console_handler.setFormatter(logging.Formatter(fmt))
+    # The listener applies the format, so the queued record carries only the message
+    logging.basicConfig(
+        level=getattr(logging, level),
+        format='%(message)s',
+        handlers=[logging.handlers.QueueHandler(_log_queue)],
+        force=True
+    )
 
 def get_logger(name: str) -> logging.Logger:
     """Returns a logger instance with the specified name"""
@@ -42,10 +67,8 @@ def setup_logger(name: str, log_file: str = None) -> logging.Logger:
     # Create formatters and handlers
     formatter = logging.Formatter(Config.LOG_FORMAT)
     
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    # Console output goes through the shared queue and its background listener
+    logger.addHandler(logging.handlers.QueueHandler(_log_queue))
     
     # File handler (optional)
     if log_file:
@@ -0,0 +1,13 @@
+-- bookmark_schema.sql
+-- Constraints for the user_bookmarks table
+
+-- Remove duplicate bookmarks left behind before the unique index existed,
+-- keeping one row for each user-article pair
+DELETE FROM user_bookmarks a
+USING user_bookmarks b
+WHERE a.user_id = b.user_id
+  AND a.news_id = b.news_id
+  AND a.ctid > b.ctid;
+
+-- One bookmark per user and article; add_bookmark upserts against this index
+CREATE UNIQUE INDEX IF NOT EXISTS idx_user_bookmarks_user_news ON user_bookmarks(user_id, news_id);
@@ -0,0 +1,27 @@
+-- news_articles_schema.sql
+-- Derived columns for the news_articles table
+
+-- YAKE keywords extracted from the article content; NULL until the article is
+-- first processed. Content never changes, so they are computed only once.
+ALTER TABLE news_articles ADD COLUMN IF NOT EXISTS filter_keywords JSONB;
+
+-- Gemini summary of the article content; NULL until the article is first summarized.
+-- Kept apart from summary, which holds the description supplied by the news API.
+ALTER TABLE news_articles ADD COLUMN IF NOT EXISTS generated_summary TEXT;
+
+-- Replaced by store_processed_articles below
+DROP FUNCTION IF EXISTS set_article_keywords(JSONB);
+
+-- Stores the derived fields for a batch of processed articles in one statement.
+-- p_articles is a JSON array of {"id": ..., "filter_keywords": [...], "generated_summary": "..."}
+-- objects; a field that is missing or null leaves the stored value unchanged.
+CREATE OR REPLACE FUNCTION store_processed_articles(p_articles JSONB)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+  UPDATE news_articles AS a
+  SET filter_keywords = COALESCE(p.filter_keywords, a.filter_keywords),
+      generated_summary = COALESCE(p.generated_summary, a.generated_summary)
+  FROM jsonb_to_recordset(p_articles) AS p(id UUID, filter_keywords JSONB, generated_summary TEXT)
+  WHERE a.id = p.id;
+$$;
@@ -0,0 +1,14 @@
+-- story_tracking_migration.sql
+-- Index changes for an existing, live tracked_stories table
+--
+-- Run this before applying story_tracking_schema.sql to a live database: the indexes
+-- are built without blocking writes, and the schema's CREATE INDEX IF NOT EXISTS
+-- statements then find them in place. CONCURRENTLY cannot run inside a transaction
+-- block, so run the file statement by statement (psql -f, without --single-transaction).
+-- A failed concurrent build leaves an INVALID index behind; drop it and run the file again.
+
+-- A user's stories, newest first (get_tracked_stories)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tracked_stories_user_created ON tracked_stories(user_id, created_at DESC);
+
+-- Superseded by idx_tracked_stories_user_created, whose leading column serves the same lookups
+DROP INDEX CONCURRENTLY IF EXISTS idx_tracked_stories_user_id;
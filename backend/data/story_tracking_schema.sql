@@ -1,8 +1,13 @@
 -- story_tracking_schema.sql
 -- Schema for story tracking feature
+--
+-- Every statement is idempotent, so the file both creates the schema on a new
+-- database and brings an existing one up to date when applied again. On a live
+-- database, run story_tracking_migration.sql first so that new indexes are built
+-- without blocking writes.
 
 -- Table for tracked stories
-CREATE TABLE tracked_stories (
+CREATE TABLE IF NOT EXISTS tracked_stories (
   id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
   user_id UUID NOT NULL REFERENCES auth.users(id),
   keyword VARCHAR(255) NOT NULL,
@@ -12,8 +17,13 @@ CREATE TABLE tracked_stories (
   last_polled_at TIMESTAMP
 );
 
+-- Adaptive polling cadence: when the story is next due, and the current gap
+-- between polls (reset on new articles, doubled while the keyword stays quiet)
+ALTER TABLE tracked_stories ADD COLUMN IF NOT EXISTS next_poll_at TIMESTAMP;
+ALTER TABLE tracked_stories ADD COLUMN IF NOT EXISTS poll_gap INTERVAL NOT NULL DEFAULT INTERVAL '5 minutes';
+
 -- Table for articles related to tracked stories
-CREATE TABLE tracked_story_articles (
+CREATE TABLE IF NOT EXISTS tracked_story_articles (
   tracked_story_id UUID REFERENCES tracked_stories(id) ON DELETE CASCADE,
   news_id UUID REFERENCES news_articles(id) ON DELETE CASCADE,
   added_at TIMESTAMP NOT NULL DEFAULT NOW(),
@@ -21,27 +31,201 @@ CREATE TABLE tracked_story_articles (
 );
 
 -- Index for faster lookups
-CREATE INDEX idx_tracked_stories_user_id ON tracked_stories(user_id);
-CREATE INDEX idx_tracked_stories_keyword ON tracked_stories(keyword);
-CREATE INDEX idx_tracked_stories_polling ON tracked_stories(is_polling);
-CREATE INDEX idx_tracked_story_articles_story_id ON tracked_story_articles(tracked_story_id);
+-- A user's stories, newest first (get_tracked_stories)
+CREATE INDEX IF NOT EXISTS idx_tracked_stories_user_created ON tracked_stories(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_tracked_stories_keyword ON tracked_stories(keyword);
+-- Only polling-enabled stories, ordered the way claim_polling_batch picks them
+CREATE INDEX IF NOT EXISTS idx_tracked_stories_next_poll ON tracked_stories(next_poll_at NULLS FIRST) WHERE is_polling;
+CREATE INDEX IF NOT EXISTS idx_tracked_story_articles_story_id ON tracked_story_articles(tracked_story_id);
+
+-- Superseded by idx_tracked_stories_user_created and idx_tracked_stories_next_poll
+DROP INDEX IF EXISTS idx_tracked_stories_user_id;
+DROP INDEX IF EXISTS idx_tracked_stories_polling;
+
+-- Remove duplicate stories left behind before the unique index existed, keeping one
+-- story for each user-keyword pair. Articles linked to a duplicate are moved onto the
+-- kept story first, since deleting the duplicate cascades to its links.
+INSERT INTO tracked_story_articles (tracked_story_id, news_id, added_at)
+SELECT b.id, tsa.news_id, tsa.added_at
+FROM tracked_stories a
+JOIN tracked_stories b
+  ON a.user_id = b.user_id
+  AND a.keyword = b.keyword
+  AND a.ctid > b.ctid
+JOIN tracked_story_articles tsa ON tsa.tracked_story_id = a.id
+ON CONFLICT (tracked_story_id, news_id) DO NOTHING;
+
+DELETE FROM tracked_stories a
+USING tracked_stories b
+WHERE a.user_id = b.user_id
+  AND a.keyword = b.keyword
+  AND a.ctid > b.ctid;
+
+-- One tracked story per user and keyword; create_tracked_story upserts against this index
+CREATE UNIQUE INDEX IF NOT EXISTS idx_tracked_stories_user_keyword ON tracked_stories(user_id, keyword);
+
+-- Links a batch of articles to one or more tracked stories and touches last_updated on
+-- every story that gained articles, in one round trip and one transaction.
+-- p_links is a JSON array of {"news_id": UUID, "added_at": TIMESTAMP} objects.
+-- Articles already linked to a story are skipped via the primary key. Returns one row
+-- per story that gained articles with the number of newly linked articles.
+-- (Data-modifying CTEs always run, so the last_updated UPDATE needs no reference.)
+DROP FUNCTION IF EXISTS add_story_links(UUID, JSONB);
+CREATE OR REPLACE FUNCTION add_story_links(p_stories UUID[], p_links JSONB)
+RETURNS TABLE(story_id UUID, added INTEGER)
+LANGUAGE sql
+AS $$
+  WITH inserted AS (
+    INSERT INTO tracked_story_articles (tracked_story_id, news_id, added_at)
+    SELECT story.id, link.news_id, COALESCE(link.added_at, NOW())
+    FROM unnest(p_stories) AS story(id)
+    CROSS JOIN jsonb_to_recordset(p_links) AS link(news_id UUID, added_at TIMESTAMP)
+    ON CONFLICT (tracked_story_id, news_id) DO NOTHING
+    RETURNING tracked_story_id
+  ), counts AS (
+    SELECT tracked_story_id, COUNT(*)::INTEGER AS added
+    FROM inserted
+    GROUP BY tracked_story_id
+  ), touched AS (
+    UPDATE tracked_stories SET last_updated = NOW()
+    FROM counts
+    WHERE tracked_stories.id = counts.tracked_story_id
+  )
+  SELECT tracked_story_id, added FROM counts;
+$$;
+
+-- Creates a tracked story and, if p_source is given, links the source article to it,
+-- in one round trip and one transaction. If the user already tracks p_keyword the
+-- existing story is returned unchanged and nothing is linked.
+-- Returns {"story": <tracked_stories row>, "created": BOOLEAN}.
+CREATE OR REPLACE FUNCTION create_tracked_story_with_source(
+  p_user UUID,
+  p_keyword VARCHAR,
+  p_source UUID,
+  p_polling BOOLEAN
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  story tracked_stories;
+BEGIN
+  INSERT INTO tracked_stories (user_id, keyword, is_polling, last_polled_at)
+  VALUES (p_user, p_keyword, p_polling, CASE WHEN p_polling THEN NOW() END)
+  ON CONFLICT (user_id, keyword) DO NOTHING
+  RETURNING * INTO story;
+
+  IF NOT FOUND THEN
+    SELECT * INTO story FROM tracked_stories WHERE user_id = p_user AND keyword = p_keyword;
+    RETURN jsonb_build_object('story', to_jsonb(story), 'created', FALSE);
+  END IF;
+
+  IF p_source IS NOT NULL THEN
+    INSERT INTO tracked_story_articles (tracked_story_id, news_id)
+    VALUES (story.id, p_source)
+    ON CONFLICT (tracked_story_id, news_id) DO NOTHING;
+  END IF;
+
+  RETURN jsonb_build_object('story', to_jsonb(story), 'created', TRUE);
+END;
+$$;
+
+-- Sets last_polled_at from the database clock whenever polling is switched on,
+-- so the application never has to send its own timestamp, and makes the story due
+-- on the next polling cycle whatever backoff it had before
+CREATE OR REPLACE FUNCTION set_polling_started_at()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  NEW.last_polled_at := NOW();
+  NEW.next_poll_at := NULL;
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS tracked_stories_polling_started ON tracked_stories;
+CREATE TRIGGER tracked_stories_polling_started
+  BEFORE UPDATE OF is_polling ON tracked_stories
+  FOR EACH ROW
+  WHEN (NEW.is_polling)
+  EXECUTE FUNCTION set_polling_started_at();
+
+-- Replaced by claim_polling_batch, which stamps last_polled_at as it claims stories
+DROP FUNCTION IF EXISTS touch_polled_at(UUID[]);
+
+-- Claims up to p_batch_size polling-enabled stories whose next_poll_at has passed,
+-- marks them as polled now and returns them, in one statement. next_poll_at is pushed
+-- out by the story's current gap so a poll that never reports back is retried later.
+-- SKIP LOCKED lets several workers claim disjoint batches concurrently.
+CREATE OR REPLACE FUNCTION claim_polling_batch(p_batch_size INTEGER)
+RETURNS TABLE(id UUID, keyword VARCHAR)
+LANGUAGE sql
+AS $$
+  UPDATE tracked_stories AS s
+  SET last_polled_at = NOW(),
+      next_poll_at = NOW() + s.poll_gap
+  WHERE s.id = ANY (ARRAY(
+    SELECT t.id
+    FROM tracked_stories t
+    WHERE t.is_polling
+      AND (t.next_poll_at IS NULL OR t.next_poll_at <= NOW())
+    ORDER BY t.next_poll_at NULLS FIRST
+    LIMIT p_batch_size
+    FOR UPDATE SKIP LOCKED
+  ))
+  RETURNING s.id, s.keyword;
+$$;
+
+-- Schedules the next poll of each story from the outcome of its last one.
+-- p_results is a JSON array of {"id": UUID, "new_articles": INTEGER} objects.
+-- Stories that gained articles go back to p_min_minutes between polls; quiet stories
+-- double their gap up to p_max_minutes. A +/-10% jitter spreads stories out so they
+-- don't fall due in the same cycle.
+CREATE OR REPLACE FUNCTION record_poll_results(
+  p_results JSONB,
+  p_min_minutes INTEGER DEFAULT 5,
+  p_max_minutes INTEGER DEFAULT 60
+)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+  WITH gaps AS (
+    SELECT r.id,
+           CASE WHEN r.new_articles > 0 THEN make_interval(mins => p_min_minutes)
+                ELSE LEAST(GREATEST(t.poll_gap, make_interval(mins => p_min_minutes)) * 2,
+                           make_interval(mins => p_max_minutes))
+           END AS gap
+    FROM jsonb_to_recordset(p_results) AS r(id UUID, new_articles INTEGER)
+    JOIN tracked_stories t ON t.id = r.id
+  )
+  UPDATE tracked_stories
+  SET poll_gap = gaps.gap,
+      next_poll_at = NOW() + gaps.gap * (0.9 + random() * 0.2)
+  FROM gaps
+  WHERE tracked_stories.id = gaps.id;
+$$;
 
 -- RLS Policies for tracked_stories
 ALTER TABLE tracked_stories ENABLE ROW LEVEL SECURITY;
 
 -- Allow users to view only their own tracked stories
+DROP POLICY IF EXISTS tracked_stories_select_policy ON tracked_stories;
 CREATE POLICY tracked_stories_select_policy ON tracked_stories 
   FOR SELECT USING (auth.uid() = user_id);
 
 -- Allow users to insert their own tracked stories
+DROP POLICY IF EXISTS tracked_stories_insert_policy ON tracked_stories;
 CREATE POLICY tracked_stories_insert_policy ON tracked_stories 
   FOR INSERT WITH CHECK (auth.uid() = user_id);
 
 -- Allow users to update only their own tracked stories
+DROP POLICY IF EXISTS tracked_stories_update_policy ON tracked_stories;
 CREATE POLICY tracked_stories_update_policy ON tracked_stories 
   FOR UPDATE USING (auth.uid() = user_id);
 
 -- Allow users to delete only their own tracked stories
+DROP POLICY IF EXISTS tracked_stories_delete_policy ON tracked_stories;
 CREATE POLICY tracked_stories_delete_policy ON tracked_stories 
   FOR DELETE USING (auth.uid() = user_id);
 
@@ -49,6 +233,7 @@ CREATE POLICY tracked_stories_delete_policy ON tracked_stories
 ALTER TABLE tracked_story_articles ENABLE ROW LEVEL SECURITY;
 
 -- Allow users to view only articles related to their tracked stories
+DROP POLICY IF EXISTS tracked_story_articles_select_policy ON tracked_story_articles;
 CREATE POLICY tracked_story_articles_select_policy ON tracked_story_articles 
   FOR SELECT USING (
     tracked_story_id IN (
@@ -57,6 +242,7 @@ CREATE POLICY tracked_story_articles_select_policy ON tracked_story_articles
   );
 
 -- Allow users to insert only articles related to their tracked stories
+DROP POLICY IF EXISTS tracked_story_articles_insert_policy ON tracked_story_articles;
 CREATE POLICY tracked_story_articles_insert_policy ON tracked_story_articles 
   FOR INSERT WITH CHECK (
     tracked_story_id IN (
@@ -65,6 +251,7 @@ CREATE POLICY tracked_story_articles_insert_policy ON tracked_story_articles
   );
 
 -- Allow users to delete only articles related to their tracked stories
+DROP POLICY IF EXISTS tracked_story_articles_delete_policy ON tracked_story_articles;
 CREATE POLICY tracked_story_articles_delete_policy ON tracked_story_articles 
   FOR DELETE USING (
     tracked_story_id IN (
@@ -16,18 +16,17 @@ Environment Variables Required:
     NEWS_API_KEY: API key for accessing the News API service
 """
 
-import os
+import orjson
 import requests
-from dotenv import load_dotenv
-import json
 from pathlib import Path
 from backend.core.config import Config
+from backend.core.utils import setup_logger
 
-# Load environment variables from .env file for configuration
-load_dotenv()
+# Initialize logger
+logger = setup_logger(__name__)
 
-# Initialize the News API key from environment variables
-NEWS_API_KEY = os.getenv('NEWS_API_KEY')
+# Initialize the News API key from the configuration, which loads the .env file
+NEWS_API_KEY = Config.NEWS_API_KEY
 
 def fetch_news(keyword='', session_id=None):
     """Fetch news articles from News API based on a keyword search.
@@ -68,14 +67,14 @@ def fetch_news(keyword='', session_id=None):
         if news_data.get('status') == 'ok':
             articles = news_data.get('articles', [])
             if not articles:
-                print("No articles found for the given keyword.")
+                logger.info(f"No articles found for keyword: {keyword}")
             
             return articles
         else:
-            print("Failed to fetch news:", news_data.get('message'))
+            logger.error(f"Failed to fetch news: {news_data.get('message')}")
 
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching news: {e}")
+        logger.error(f"Error fetching news: {str(e)}")
 
 def write_to_file(articles, session_id=None):
     """Save fetched news articles to a JSON file.
@@ -105,11 +104,11 @@ def write_to_file(articles, session_id=None):
     file_path = Config.NEWS_DATA_DIR / file_name
     try:
         # Save the articles as formatted JSON for better readability
-        with open(file_path, 'w') as file:
-            json.dump(articles, file, indent=4)
-        print(f"Articles successfully saved to {file_path}")
+        with open(file_path, 'wb') as file:
+            file.write(orjson.dumps(articles, option=orjson.OPT_INDENT_2))
+        logger.info(f"Articles successfully saved to {file_path}")
     except IOError as e:
-        print(f"Error writing to file: {e}")
+        logger.error(f"Error writing to file: {str(e)}")
 
 if __name__ == '__main__':
     fetch_news()
\ No newline at end of file
@@ -25,11 +25,12 @@ from backend.microservices.storage.search_logger import log_user_search
 from backend.microservices.storage.bookmark_service import (
     add_bookmark,
     get_user_bookmarks,
+    get_bookmark_ids,
     delete_bookmark
 )
 
 # Import centralized Supabase client
-from backend.core.supabase_client import supabase
+from backend.core.supabase_client import supabase, select_in_chunks
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -37,6 +38,19 @@ logger.setLevel(logging.INFO)
 
 logger.info("News Storage Service initialized with Supabase configuration")
 
+def _article_row(article):
+    """Maps a fetched article onto the columns of the news_articles table."""
+    return {
+        "title": article["title"],
+        "summary": article.get("summary", ""),
+        "content": article.get("content", ""),
+        # Handle source field which can be a dict (from API) or a plain string
+        "source": article["source"]["name"] if isinstance(article.get("source"), dict) else article["source"],
+        "published_at": article["publishedAt"],
+        "url": article["url"],
+        "image": article.get("urlToImage", "")
+    }
+
 def store_article_in_supabase(article):
     """
     Inserts a news article into the Supabase news_articles table if it doesn't already exist.
@@ -59,33 +73,66 @@ def store_article_in_supabase(article):
     Returns:
         str: The ID of the article (either existing or newly created)
     """
-    logger.debug(f"Attempting to store article: {article.get('title')} from {article.get('url')}")
+    logger.debug("Attempting to store article: %s from %s", article.get('title'), article.get('url'))
     
     # Check if the article already exists using the URL as unique identifier
     try:
-        existing = supabase.table("news_articles").select("*").eq("url", article["url"]).execute()
-        if existing.data and len(existing.data) > 0:
+        existing = supabase.table("news_articles").select("id").eq("url", article["url"]).execute()
+        if existing.data:
             # Article already exists; return its id
             logger.info(f"Article already exists with ID: {existing.data[0]['id']}")
             return existing.data[0]["id"]
         else:
             # Insert a new article with all available fields
             logger.debug("Article not found in database, proceeding with insertion")
-            result = supabase.table("news_articles").insert({
-                "title": article["title"],
-                "summary": article.get("summary", ""),
-                "content": article.get("content", ""),
-                # Handle source field which can be a dict (from API) or a plain string
-                "source": article["source"]["name"] if isinstance(article.get("source"), dict) else article["source"],
-                "published_at": article["publishedAt"],
-                "url": article["url"],
-                "image": article.get("urlToImage", "")
-            }).execute()
+            result = supabase.table("news_articles").insert(_article_row(article)).execute()
             logger.info(f"Successfully stored new article with ID: {result.data[0]['id']}")
             return result.data[0]["id"]
     except Exception as e:
         logger.error(f"Error storing article in Supabase: {str(e)}")
         raise
 
+def store_articles_in_supabase(articles):
+    """
+    Stores a batch of news articles in the news_articles table and returns their IDs.
+
+    New articles are written with a single upsert on the unique URL column. Articles that
+    already exist are left untouched, so summaries written later are never overwritten,
+    and their IDs are looked up with one additional query.
+
+    Args:
+        articles (list): Article dictionaries in the format accepted by store_article_in_supabase
+
+    Returns:
+        list: The ID of each article, in the same order as the input
+    """
+    if not articles:
+        return []
+
+    # Collapse repeated URLs so each row appears once in the upsert
+    rows = {}
+    for article in articles:
+        rows.setdefault(article["url"], _article_row(article))
+    logger.debug("Storing %d articles (%d distinct URLs)", len(articles), len(rows))
+
+    try:
+        result = supabase.table("news_articles") \
+            .upsert(list(rows.values()), on_conflict="url", ignore_duplicates=True) \
+            .execute()
+        ids_by_url = {row["url"]: row["id"] for row in result.data or []}
+
+        # Rows skipped as duplicates are not returned, so fetch the IDs of the existing articles
+        existing_urls = [url for url in rows if url not in ids_by_url]
+        if existing_urls:
+            # URLs are long, so look them up in smaller chunks than IDs
+            existing = select_in_chunks("news_articles", "id, url", "url", existing_urls, chunk_size=20)
+            ids_by_url.update({row["url"]: row["id"] for row in existing})
+
+        logger.info(f"Stored {len(result.data or [])} new articles, {len(existing_urls)} already existed")
+        return [ids_by_url.get(article["url"]) for article in articles]
+    except Exception as e:
+        logger.error(f"Error storing articles in Supabase: {str(e)}")
+        raise
+
 # The functions log_user_search, add_bookmark, get_user_bookmarks, and delete_bookmark
 # have been moved to dedicated modules in the storage directory and are now imported above
\ No newline at end of file
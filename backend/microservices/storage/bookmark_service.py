@@ -16,8 +16,9 @@ Environment Variables Required:
 
 import logging
 
-# Import centralized Supabase client
+# Import centralized Supabase client and cache helpers
 from backend.core.supabase_client import supabase
+from backend.core.redis_client import cache_get, cache_set, cache_delete
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -25,6 +26,17 @@ logger.setLevel(logging.INFO)
 
 logger.info("Bookmark Service initialized with Supabase configuration")
 
+# Article columns returned by default, enough for list views (full content is excluded)
+BOOKMARK_ARTICLE_FIELDS = ("id", "title", "summary", "source", "published_at", "url", "image")
+
+# Field of the bookmarks cache hash holding the user's {news_id: bookmark_id} lookup;
+# it shares the key with the article lists, so the same invalidation clears both
+BOOKMARK_IDS_CACHE_FIELD = "news_id->bookmark_id"
+
+def _bookmarks_cache_key(user_id):
+    """Returns the cache key holding a user's bookmarked articles."""
+    return f"bookmarks:{user_id}"
+
 def add_bookmark(user_id, news_id):
     """
     Adds a bookmark by inserting a record into the user_bookmarks table.
@@ -45,46 +57,50 @@ def add_bookmark(user_id, news_id):
     """
     logger.info(f"Adding bookmark for user {user_id} to article {news_id}")
     try:
-        # Check if bookmark already exists
-        existing = supabase.table("user_bookmarks") \
-            .select("*") \
-            .eq("user_id", user_id) \
-            .eq("news_id", news_id) \
-            .execute()
-
-        if existing.data and len(existing.data) > 0:
-            logger.info(f"Bookmark already exists for user {user_id} and article {news_id}")
-            return existing.data[0]
-
-        # Insert a new bookmark record linking user to article
-        result = supabase.table("user_bookmarks").insert({
+        # Insert the bookmark, relying on the unique (user_id, news_id) index to skip duplicates
+        result = supabase.table("user_bookmarks").upsert({
             "user_id": user_id,
             "news_id": news_id,
-        }).execute()
+        }, on_conflict="user_id,news_id", ignore_duplicates=True).execute()
 
-        # Return the first data item if available, otherwise None
-        bookmark_id = result.data[0]["id"] if result.data else None
+        if not result.data:
+            # Nothing was inserted, so the bookmark already exists; fetch it for the caller
+            logger.info(f"Bookmark already exists for user {user_id} and article {news_id}")
+            existing = supabase.table("user_bookmarks") \
+                .select("*") \
+                .eq("user_id", user_id) \
+                .eq("news_id", news_id) \
+                .limit(1) \
+                .execute()
+            return existing.data[0] if existing.data else None
+
+        # The user's cached bookmark list is now stale
+        cache_delete(_bookmarks_cache_key(user_id))
+
+        bookmark_id = result.data[0]["id"]
         logger.info(f"Successfully added bookmark with ID: {bookmark_id}")
-        return result.data[0] if result.data else None
+        return result.data[0]
     except Exception as e:
         logger.error(f"Error adding bookmark: {str(e)}")
         # Re-raise the exception for proper error handling upstream
         raise e
 
-def get_user_bookmarks(user_id):
+def get_user_bookmarks(user_id, fields=BOOKMARK_ARTICLE_FIELDS):
     """
-    Retrieves all bookmarked articles for a user with full article details.
+    Retrieves all bookmarked articles for a user with their article details.
     
     This function performs a join between the user_bookmarks table and the news_articles table
-    to retrieve complete article information for all articles bookmarked by the specified user.
+    to retrieve the requested article columns for all articles bookmarked by the specified user.
     The results are transformed into a more user-friendly format where each article includes its
     bookmark_id for reference.
     
     Args:
         user_id (str): The ID of the user whose bookmarks should be retrieved
+        fields (tuple, optional): Article columns to return. Defaults to BOOKMARK_ARTICLE_FIELDS;
+                                  pass ("*",) to include every column, such as the full content.
     
     Returns:
-        list: A list of dictionaries, each containing the full details of a bookmarked article
+        list: A list of dictionaries, each containing the details of a bookmarked article
               with an additional 'bookmark_id' field
     
     Raises:
@@ -92,24 +108,31 @@ def get_user_bookmarks(user_id):
     """
     logger.info(f"Retrieving bookmarks for user {user_id}")
     try:
-        # Query user_bookmarks and join with news_articles to get full article details
+        # Serve from the cache when the bookmarks were fetched recently
+        cache_key = _bookmarks_cache_key(user_id)
+        projection = ",".join(fields)
+        cached = cache_get(cache_key, field=projection)
+        if cached is not None:
+            logger.info(f"Retrieved {len(cached)} cached bookmarks for user {user_id}")
+            return cached
+
+        # Query user_bookmarks and join with news_articles to get the article details
         # This uses Supabase's foreign key relationships to perform the join
         result = supabase.table("user_bookmarks") \
-            .select(
-                "id,"
-                "news_articles(id,title,summary,content,source,published_at,url,image)"
-            ) \
+            .select(f"id, news_articles({projection})") \
             .eq("user_id", user_id) \
             .execute()
         
         # Transform the nested result structure to a more friendly format
-        # by flattening the news_articles data and adding the bookmark_id
-        bookmarks = []
-        for item in result.data:
-            article = item["news_articles"]
-            article["bookmark_id"] = item["id"]  # Add bookmark ID to article for reference
-            bookmarks.append(article)
+        # by flattening the news_articles data and adding the bookmark_id.
+        # New dicts are built so the query result is never mutated in place.
+        bookmarks = [
+            {**item["news_articles"], "bookmark_id": item["id"]}
+            for item in result.data or []
+            if item.get("news_articles")
+        ]
         
+        cache_set(cache_key, bookmarks, field=projection)
         logger.info(f"Retrieved {len(bookmarks)} bookmarks for user {user_id}")
         return bookmarks
     except Exception as e:
@@ -117,6 +140,41 @@ def get_user_bookmarks(user_id):
         # Re-raise the exception for proper error handling upstream
         raise e
 
+def get_bookmark_ids(user_id):
+    """
+    Returns which articles a user has bookmarked, for marking articles in a listing.
+    
+    The whole lookup is cached, so checking a batch of articles against it needs no
+    database round trip while the cache is warm.
+    
+    Args:
+        user_id (str): The ID of the user whose bookmarks should be looked up
+    
+    Returns:
+        dict: Maps the news_id of every bookmarked article to its bookmark ID
+    
+    Raises:
+        Exception: If there's an error during the database operation
+    """
+    try:
+        cache_key = _bookmarks_cache_key(user_id)
+        cached = cache_get(cache_key, field=BOOKMARK_IDS_CACHE_FIELD)
+        if cached is not None:
+            return cached
+
+        result = supabase.table("user_bookmarks") \
+            .select("id, news_id") \
+            .eq("user_id", user_id) \
+            .execute()
+        
+        bookmark_ids = {item["news_id"]: item["id"] for item in result.data or []}
+        cache_set(cache_key, bookmark_ids, field=BOOKMARK_IDS_CACHE_FIELD)
+        return bookmark_ids
+    except Exception as e:
+        logger.error(f"Error fetching bookmark IDs: {str(e)}")
+        # Re-raise the exception for proper error handling upstream
+        raise e
+
 def delete_bookmark(user_id, bookmark_id):
     """
     Deletes a bookmark from the user_bookmarks table.
@@ -147,7 +205,9 @@ def delete_bookmark(user_id, bookmark_id):
             .execute()
         
         # Return True if at least one record was deleted, False otherwise
-        success = len(result.data) > 0
+        success = bool(result.data)
+        if success:
+            cache_delete(_bookmarks_cache_key(user_id))
         logger.info(f"Bookmark deletion {'successful' if success else 'unsuccessful'}")
         return success
     except Exception as e:
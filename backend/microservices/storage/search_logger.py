@@ -5,6 +5,10 @@ Search Logger Module
 This module provides functionality for logging user search and article view events.
 It records user interactions with news articles for analytics and personalization purposes.
 
+Events are not written on the request thread. They are placed on a bounded in-memory
+queue and a background thread inserts them into Supabase in batches. When the queue is
+full, new events are dropped rather than blocking the caller.
+
 The module uses the Supabase client to interact with the following tables:
 - user_search_history: Tracks user search and article view interactions
 
@@ -13,8 +17,12 @@ Environment Variables Required:
 - SUPABASE_SERVICE_ROLE_KEY: Service role key for admin operations
 """
 
+import atexit
 import datetime
 import logging
+import queue
+import threading
+import time
 
 # Import centralized Supabase client
 from backend.core.supabase_client import supabase
@@ -23,14 +31,80 @@ from backend.core.supabase_client import supabase
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Buffering configuration for search event writes
+SEARCH_LOG_QUEUE_SIZE = 20000    # Maximum number of events waiting to be written
+SEARCH_LOG_BATCH_SIZE = 500      # Maximum number of events written per insert
+SEARCH_LOG_FLUSH_INTERVAL = 0.1  # Seconds to wait for more events before writing a batch
+
+_search_queue = queue.Queue(maxsize=SEARCH_LOG_QUEUE_SIZE)
+
+def _insert_batch(batch):
+    """
+    Writes a batch of search events to the user_search_history table.
+
+    Errors are logged and the batch is discarded, so a failed write never stops the
+    background flusher.
+
+    Args:
+        batch (list): The search event records to insert
+    """
+    try:
+        supabase.table("user_search_history").insert(batch, returning="minimal").execute()
+        logger.debug("Wrote %d search events", len(batch))
+    except Exception as e:
+        logger.error(f"Error writing {len(batch)} search events: {str(e)}")
+
+def _flush_worker():
+    """
+    Background loop that drains the queue and writes events in batches.
+
+    Blocks until an event arrives, then keeps collecting events until either
+    SEARCH_LOG_BATCH_SIZE is reached or SEARCH_LOG_FLUSH_INTERVAL has elapsed.
+    """
+    while True:
+        batch = [_search_queue.get()]
+        deadline = time.monotonic() + SEARCH_LOG_FLUSH_INTERVAL
+        while len(batch) < SEARCH_LOG_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_search_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        _insert_batch(batch)
+
+def flush_search_logs():
+    """
+    Synchronously writes all queued search events.
+
+    Registered with atexit so that pending events are persisted on a clean shutdown.
+    """
+    batch = []
+    while True:
+        try:
+            batch.append(_search_queue.get_nowait())
+        except queue.Empty:
+            break
+        if len(batch) >= SEARCH_LOG_BATCH_SIZE:
+            _insert_batch(batch)
+            batch = []
+    if batch:
+        _insert_batch(batch)
+
+_flush_thread = threading.Thread(target=_flush_worker, name="search-log-flusher", daemon=True)
+_flush_thread.start()
+atexit.register(flush_search_logs)
+
 logger.info("Search Logger Service initialized with Supabase configuration")
 
 def log_user_search(user_id, news_id, session_id):
     """
-    Logs a search event by inserting a record into the user_search_history join table.
+    Logs a search event by queueing a record for the user_search_history join table.
     
     This function creates a record of a user viewing or searching for a specific article,
     which can be used for analytics, personalization, and tracking user activity across sessions.
+    The record is written asynchronously by the background flusher.
     
     Args:
         user_id (str): The ID of the user performing the search
@@ -38,22 +112,22 @@ def log_user_search(user_id, news_id, session_id):
         session_id (str): The current session identifier for tracking user activity
     
     Returns:
-        dict: The Supabase response object containing the result of the insert operation
+        bool: True if the event was queued, False if it was dropped because the queue is full
     """
     logger.info(f"Logging search event for user {user_id}, article {news_id}, session {session_id}")
+    # Create a timestamp for when the search occurred
+    current_time = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    
     try:
-        # Create a timestamp for when the search occurred
-        current_time = datetime.datetime.utcnow().isoformat()
-        
-        # Insert the search record with all required fields
-        result = supabase.table("user_search_history").insert({
+        # Queue the search record with all required fields
+        _search_queue.put_nowait({
             "user_id": user_id,
             "news_id": news_id,
             "searched_at": current_time,
             "session_id": session_id,
-        }).execute()
-        logger.debug(f"Search event logged successfully")
-        return result
-    except Exception as e:
-        logger.error(f"Error logging search event: {str(e)}")
-        raise e
\ No newline at end of file
+        })
+        logger.debug("Search event queued")
+        return True
+    except queue.Full:
+        logger.warning(f"Search log queue full, dropping event for user {user_id}, article {news_id}")
+        return False
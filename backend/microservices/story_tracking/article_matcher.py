@@ -8,10 +8,15 @@ It integrates with the news fetcher service to find relevant articles based on k
 
 import datetime
 import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from backend.microservices.news_fetcher import fetch_news
-from backend.microservices.news_storage import store_article_in_supabase
+from backend.microservices.news_storage import store_articles_in_supabase
+from backend.microservices.story_tracking.article_retriever import invalidate_story_articles
 
-# Import centralized Supabase client
+# Import centralized Supabase client and configuration
+from backend.core.config import Config
 from backend.core.supabase_client import supabase
 
 # Initialize logger
@@ -20,31 +25,95 @@ logger.setLevel(logging.INFO)
 
 logger.info("Article Matcher Service initialized with Supabase configuration")
 
-def find_related_articles(story_id, keyword):
+# Background pool for article fetches triggered by user requests, so the HTTP
+# response doesn't wait on the news API
+_background = ThreadPoolExecutor(max_workers=4, thread_name_prefix="story-fetch")
+
+# Stories waiting for a background fetch, keyed by (keyword, force); requests for the
+# same keyword within STORY_FETCH_DEBOUNCE seconds join one batch and one news fetch
+_pending_fetches = {}
+_pending_lock = threading.Lock()
+
+# Fractional seconds in Postgres timestamps, which can have fewer than six digits
+_FRACTION_RE = re.compile(r"\.(\d+)")
+
+def _parse_timestamp(value):
+    """
+    Parses a Postgres timestamp string into a UTC datetime.
+
+    datetime.fromisoformat on Python 3.10 only accepts 3 or 6 fractional digits
+    and no 'Z' suffix, so both are normalized first. Naive values are treated as UTC.
+    """
+    value = _FRACTION_RE.sub(lambda m: "." + m.group(1)[:6].ljust(6, "0"), value.replace("Z", "+00:00"), count=1)
+    parsed = datetime.datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+def _in_cooldown(story, now):
+    """Returns True if the story gained articles within STORY_REFRESH_COOLDOWN minutes before now."""
+    last_updated = story.get("last_updated")
+    if not last_updated or Config.STORY_REFRESH_COOLDOWN <= 0:
+        return False
+    try:
+        elapsed = now - _parse_timestamp(last_updated)
+    except ValueError:
+        logger.warning(f"Could not parse last_updated '{last_updated}'")
+        return False
+    return elapsed < datetime.timedelta(minutes=Config.STORY_REFRESH_COOLDOWN)
+
+def find_related_articles(story_id, keyword, force=False):
     """
     Finds and adds articles related to a tracked story based on its keyword.
     
+    Stories whose last_updated falls within the STORY_REFRESH_COOLDOWN window are
+    skipped without calling the news API, unless force is set.
+    
     Args:
         story_id: The ID of the tracked story
         keyword: The keyword to search for
+        force: Fetch even if the story is within its refresh cooldown
         
     Returns:
         Number of new articles added
     """
-    logger.info(f"Finding related articles for story {story_id}, keyword: '{keyword}'")
+    return find_related_articles_batch([story_id], keyword, force).get(story_id, 0)
+
+def find_related_articles_batch(story_ids, keyword, force=False):
+    """
+    Finds and adds articles for several tracked stories that share the same keyword.
+    
+    The news API is called once for the keyword and the results are stored once,
+    then linked to every story that is not within its refresh cooldown.
+    
+    Args:
+        story_ids: The IDs of the tracked stories
+        keyword: The keyword the stories track
+        force: Fetch even if the stories are within their refresh cooldown
+        
+    Returns:
+        Dict mapping each story ID to the number of new articles added
+    """
+    logger.info(f"Finding related articles for {len(story_ids)} stories, keyword: '{keyword}'")
+    counts = {story_id: 0 for story_id in story_ids}
     try:
-        # Get the tracked story to check when it was last updated
+        # Get the tracked stories to check when they were last updated
         story_result = supabase.table("tracked_stories") \
-            .select("*") \
-            .eq("id", story_id) \
+            .select("id, last_updated") \
+            .in_("id", list(story_ids)) \
             .execute()
         
-        if not story_result.data or len(story_result.data) == 0:
-            logger.warning(f"No story found with ID {story_id}")
-            return 0
+        stories = story_result.data or []
+        if not stories:
+            logger.warning(f"No stories found with IDs {story_ids}")
+            return counts
         
-        story = story_result.data[0]
-        logger.debug(f"Found story: {story['keyword']}")
+        # One timestamp serves the cooldown checks and every link in this batch
+        now = datetime.datetime.now(datetime.timezone.utc)
+        due_ids = [story["id"] for story in stories if force or not _in_cooldown(story, now)]
+        if not due_ids:
+            logger.info(f"All stories for keyword '{keyword}' were updated recently, skipping fetch (cooldown)")
+            return counts
         
         # Fetch articles related to the keyword
         logger.info(f"Fetching articles for keyword '{keyword}'")
@@ -52,52 +121,84 @@ def find_related_articles(story_id, keyword):
         
         if not articles:
             logger.info(f"No articles found for keyword '{keyword}'")
-            return 0
+            return counts
         
         logger.info(f"Found {len(articles)} articles for keyword '{keyword}'")
         
-        # Get existing article IDs for this story to avoid duplicates
-        logger.debug(f"Getting existing article IDs for story {story_id}")
-        existing_result = supabase.table("tracked_story_articles") \
-            .select("news_id") \
-            .eq("tracked_story_id", story_id) \
-            .execute()
-        
-        existing_ids = [item["news_id"] for item in existing_result.data] if existing_result.data else []
-        logger.debug(f"Found {len(existing_ids)} existing article IDs")
+        # First, store the articles in the news_articles table in one bulk upsert
+        article_ids = store_articles_in_supabase(articles)
         
-        # Process and add new articles
-        new_articles_count = 0
-        for article in articles:
-            # First, store the article in the news_articles table
-            logger.debug(f"Storing article: {article.get('title', 'No title')}")
-            article_id = store_article_in_supabase(article)
-            logger.debug(f"Article stored with ID: {article_id}")
-            
-            # If this article is not already linked to the story, add it
-            if article_id not in existing_ids:
-                logger.debug(f"Linking new article {article_id} to story {story_id}")
-                supabase.table("tracked_story_articles").insert({
-                    "tracked_story_id": story_id,
+        # Collect one link per distinct stored article; links that already exist
+        # for a story are skipped by the database
+        # All links in the batch share one insertion timestamp
+        now_iso = now.isoformat()
+        new_links = []
+        seen_ids = set()
+        for article, article_id in zip(articles, article_ids):
+            logger.debug("Article '%s' stored with ID: %s", article.get('title', 'No title'), article_id)
+            if article_id and article_id not in seen_ids:
+                seen_ids.add(article_id)
+                new_links.append({
                     "news_id": article_id,
-                    "added_at": datetime.datetime.utcnow().isoformat()
-                }).execute()
-                new_articles_count += 1
-            else:
-                logger.debug(f"Article {article_id} already linked to story")
+                    "added_at": now_iso
+                })
         
-        logger.info(f"Added {new_articles_count} new articles to story {story_id}")
+        # Link the articles to every due story and touch their last_updated timestamps
+        # in a single multi-row insert, which reports how many links were new per story
+        result = supabase.rpc("add_story_links", {
+            "p_stories": due_ids,
+            "p_links": new_links
+        }).execute()
+        for row in result.data or []:
+            counts[row["story_id"]] = row["added"]
+            invalidate_story_articles(row["story_id"])
         
-        # Update the last_updated timestamp of the tracked story
-        if new_articles_count > 0:
-            logger.debug(f"Updating last_updated timestamp for story {story_id}")
-            supabase.table("tracked_stories") \
-                .update({"last_updated": datetime.datetime.utcnow().isoformat()}) \
-                .eq("id", story_id) \
-                .execute()
+        for story_id in due_ids:
+            logger.info(f"Added {counts[story_id]} new articles to story {story_id}")
         
-        return new_articles_count
+        return counts
     
     except Exception as e:
         logger.error(f"Error finding related articles: {str(e)}")
-        raise e
\ No newline at end of file
+        raise e
+
+def _log_background_failure(future):
+    """Logs the error from a background article fetch, which would otherwise be lost."""
+    error = future.exception()
+    if error:
+        logger.error(f"Background article fetch failed: {str(error)}")
+
+def _submit_pending_fetch(key):
+    """Hands the stories collected for a keyword to the background pool as one batch."""
+    with _pending_lock:
+        story_ids = _pending_fetches.pop(key)
+    keyword, force = key
+    logger.debug(f"Fetching articles for {len(story_ids)} stories with keyword '{keyword}'")
+    future = _background.submit(find_related_articles_batch, story_ids, keyword, force)
+    future.add_done_callback(_log_background_failure)
+
+def schedule_related_articles(story_id, keyword, force=False):
+    """
+    Fetches related articles for a story in the background and returns immediately.
+    
+    The fetch starts after a short debounce window (Config.STORY_FETCH_DEBOUNCE); stories
+    scheduled for the same keyword in the meantime, e.g. by other users starting to track
+    the same topic, are updated by the same find_related_articles_batch() call.
+    Articles become visible to readers of the story once the fetch completes.
+    
+    Args:
+        story_id: The ID of the tracked story
+        keyword: The keyword to search for
+        force: Fetch even if the story is within its refresh cooldown
+    """
+    logger.debug(f"Scheduling background article fetch for story {story_id}")
+    key = (keyword, force)
+    with _pending_lock:
+        if key in _pending_fetches:
+            _pending_fetches[key].append(story_id)
+            return
+        _pending_fetches[key] = [story_id]
+    
+    timer = threading.Timer(Config.STORY_FETCH_DEBOUNCE, _submit_pending_fetch, args=(key,))
+    timer.daemon = True
+    timer.start()
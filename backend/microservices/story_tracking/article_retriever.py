@@ -10,8 +10,9 @@ between tracked stories and their associated articles.
 import datetime
 import logging
 
-# Import centralized Supabase client
+# Import centralized Supabase client and cache helpers
 from backend.core.supabase_client import supabase
+from backend.core.redis_client import cache_get, cache_set, cache_delete
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -19,115 +20,62 @@ logger.setLevel(logging.INFO)
 
 logger.info("Article Retriever Service initialized with Supabase configuration")
 
-def get_articles_for_stories(story_ids):
-    """
-    Gets all articles related to multiple tracked stories in a single batch operation.
+# Article columns returned by default, enough for list views (full content is excluded)
+STORY_ARTICLE_FIELDS = ("id", "title", "summary", "source", "published_at", "url", "image")
 
-    Args:
-        story_ids: List of story IDs to fetch articles for
+def _story_articles_cache_key(story_id):
+    """Returns the cache key holding a tracked story's articles."""
+    return f"story_articles:{story_id}"
 
-    Returns:
-        Dict mapping story_id to list of articles
+def invalidate_story_articles(story_id):
     """
-    logger.info(f"Getting articles for {len(story_ids)} stories")
-    try:
-        if not story_ids:
-            return {}
-
-        # Get all article references for all stories in a single query
-        result = supabase.table("tracked_story_articles") \
-            .select("tracked_story_id, news_id, added_at") \
-            .in_("tracked_story_id", story_ids) \
-            .order("added_at", desc=True) \
-            .execute()
-
-        article_refs = result.data if result.data else []
-        logger.info(f"Found {len(article_refs)} article references across {len(story_ids)} stories")
-
-        if not article_refs:
-            return {story_id: [] for story_id in story_ids}
-
-        # Collect all unique news IDs and fetch article details in a single batch query
-        news_ids = list(set(ref["news_id"] for ref in article_refs))
-        logger.debug(f"Fetching details for {len(news_ids)} unique articles")
-        articles_result = supabase.table("news_articles") \
-            .select("*") \
-            .in_("id", news_ids) \
-            .execute()
+    Drops the cached articles for a tracked story.
 
-        # Create a lookup dict keyed by article ID
-        article_lookup = {}
-        if articles_result.data:
-            for article in articles_result.data:
-                article_lookup[article["id"]] = article
+    This should be called whenever new articles are linked to the story.
 
-        # Group articles by story_id
-        articles_by_story = {story_id: [] for story_id in story_ids}
-        for ref in article_refs:
-            article = article_lookup.get(ref["news_id"])
-            if article:
-                # Add the added_at timestamp from the join table
-                article["added_at"] = ref["added_at"]
-                articles_by_story[ref["tracked_story_id"]].append(article)
-            else:
-                logger.warning(f"No data found for article {ref['news_id']}")
-
-        return articles_by_story
-
-    except Exception as e:
-        logger.error(f"Error getting articles for stories: {str(e)}")
-        raise e
+    Args:
+        story_id: The ID of the tracked story
+    """
+    cache_delete(_story_articles_cache_key(story_id))
 
-def get_story_articles(story_id):
+def get_story_articles(story_id, fields=STORY_ARTICLE_FIELDS):
     """
     Gets all articles related to a tracked story.
     
     Args:
         story_id: The ID of the tracked story
+        fields: Article columns to return. Defaults to STORY_ARTICLE_FIELDS;
+                pass ("*",) to include every column, such as the full content.
         
     Returns:
         List of articles related to the tracked story
     """
     logger.info(f"Getting articles for story {story_id}")
     try:
-        # Get all article IDs related to the tracked story
+        # Serve from the cache when the articles were fetched recently
+        cache_key = _story_articles_cache_key(story_id)
+        projection = ",".join(fields)
+        cached = cache_get(cache_key, field=projection)
+        if cached is not None:
+            logger.info(f"Found {len(cached)} cached articles")
+            return cached
+
+        # Get all articles related to the tracked story in a single query
+        # This uses Supabase's foreign key relationships to embed news_articles
         result = supabase.table("tracked_story_articles") \
-            .select("news_id, added_at") \
+            .select(f"added_at, news_articles({projection})") \
             .eq("tracked_story_id", story_id) \
             .order("added_at", desc=True) \
             .execute()
-        
-        article_refs = result.data if result.data else []
-        logger.info(f"Found {len(article_refs)} article references")
-
-        if not article_refs:
-            return []
-
-        # Get the full article details for all articles in a single batch query
-        news_ids = [ref["news_id"] for ref in article_refs]
-        logger.debug(f"Fetching details for {len(news_ids)} articles")
-        articles_result = supabase.table("news_articles") \
-            .select("*") \
-            .in_("id", news_ids) \
-            .execute()
-
-        # Create a lookup dict keyed by article ID
-        article_lookup = {}
-        if articles_result.data:
-            for article in articles_result.data:
-                article_lookup[article["id"]] = article
 
-        # Map results to maintain order from article_refs and add timestamps
-        articles = []
-        for ref in article_refs:
-            article = article_lookup.get(ref["news_id"])
-            if article:
-                # Add the added_at timestamp from the join table
-                article["added_at"] = ref["added_at"]
-                articles.append(article)
-                logger.debug(f"Added article: {article.get('title', 'No title')}")
-            else:
-                logger.warning(f"No data found for article {ref['news_id']}")
+        # Flatten the joined rows, adding the added_at timestamp from the join table
+        articles = [
+            {**row["news_articles"], "added_at": row["added_at"]}
+            for row in result.data or []
+            if row.get("news_articles")
+        ]
+        cache_set(cache_key, articles, field=projection)
+        logger.info(f"Found {len(articles)} articles")
 
         return articles
     
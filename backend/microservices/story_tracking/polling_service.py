@@ -6,11 +6,14 @@ This module provides functionality for managing polling of tracked stories.
 It handles enabling/disabling polling for stories and updating stories with new articles.
 """
 
-import datetime
 import logging
-from backend.microservices.story_tracking.article_matcher import find_related_articles
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from backend.microservices.story_tracking.article_matcher import find_related_articles_batch
+from backend.microservices.story_tracking.story_manager import project_story_fields
 
-# Import centralized Supabase client
+# Import centralized Supabase client and configuration
+from backend.core.config import Config
 from backend.core.supabase_client import supabase
 
 # Initialize logger
@@ -19,6 +22,9 @@ logger.setLevel(logging.INFO)
 
 logger.info("Polling Service initialized with Supabase configuration")
 
+# Number of due stories claimed per claim_polling_batch call
+POLLING_BATCH_SIZE = 200
+
 def toggle_polling(user_id, story_id, enable=True):
     """
     Enables or disables polling for a tracked story.
@@ -33,45 +39,29 @@ def toggle_polling(user_id, story_id, enable=True):
     """
     logger.info(f"{'Enabling' if enable else 'Disabling'} polling for story {story_id}, user {user_id}")
     try:
-        # Verify that the story belongs to the user
-        story_result = supabase.table("tracked_stories") \
-            .select("*") \
-            .eq("id", story_id) \
-            .eq("user_id", user_id) \
-            .execute()
-        
-        if not story_result.data or len(story_result.data) == 0:
-            logger.warning(f"No story found with ID {story_id} for user {user_id}")
-            return None
-        
-        current_time = datetime.datetime.utcnow().isoformat()
-        
-        # Update the story's polling status
+        # Update the story's polling status; when polling is enabled, a database
+        # trigger sets last_polled_at to the server's NOW()
         update_data = {
             "is_polling": enable
         }
         
-        # If enabling polling, also set the last_polled_at timestamp
-        if enable:
-            update_data["last_polled_at"] = current_time
-        
+        # Filtering on user_id enforces ownership: no rows come back if the story
+        # doesn't exist or belongs to another user
         result = supabase.table("tracked_stories") \
             .update(update_data) \
             .eq("id", story_id) \
             .eq("user_id", user_id) \
             .execute()
         
-        if not result.data or len(result.data) == 0:
-            logger.error(f"Failed to update polling status for story {story_id}")
+        if not result.data:
+            logger.warning(f"No story found with ID {story_id} for user {user_id}")
             return None
         
-        updated_story = result.data[0]
+        updated_story = project_story_fields(result.data[0])
         logger.info(f"Successfully {'enabled' if enable else 'disabled'} polling for story {story_id}")
         
-        # If polling was enabled, fetch articles immediately
-        if enable:
-            logger.debug(f"Performing initial article fetch for newly enabled polling")
-            find_related_articles(story_id, updated_story["keyword"])
+        # No separate initial fetch is needed: enabling polling clears next_poll_at
+        # (set_polling_started_at trigger), so the worker's next cycle polls the story
         
         return updated_story
     
@@ -79,60 +69,46 @@ def toggle_polling(user_id, story_id, enable=True):
         logger.error(f"Error toggling polling status: {str(e)}")
         raise e
 
-def get_polling_stories():
+def _poll_keyword(keyword, story_ids):
     """
-    Gets all tracked stories that have polling enabled.
+    Polls all stories sharing a keyword for new articles, with one news fetch.
     
-    This function is intended to be called by the polling worker to fetch
-    all stories that need to be checked for updates.
+    The refresh cooldown is bypassed: claim_polling_batch only hands out stories
+    whose next poll is due, and a story skipped for its cooldown would be reported
+    as quiet and have its polling gap doubled.
     
+    Args:
+        keyword: The keyword the stories track
+        story_ids: The IDs of the stories tracking it
+        
     Returns:
-        List of tracked stories with polling enabled
+        dict: Mapping of story ID to number of new articles added
     """
-    logger.info("Getting all stories with polling enabled")
-    try:
-        result = supabase.table("tracked_stories") \
-            .select("*") \
-            .eq("is_polling", True) \
-            .execute()
-        
-        stories = result.data if result.data else []
-        logger.info(f"Found {len(stories)} stories with polling enabled")
-        return stories
-    
-    except Exception as e:
-        logger.error(f"Error getting polling stories: {str(e)}")
-        raise e
+    logger.debug("Polling %d stories, keyword: %r", len(story_ids), keyword)
+    return find_related_articles_batch(story_ids, keyword, force=True)
 
-def update_polling_timestamp(story_id):
+def _record_poll_results(poll_results):
     """
-    Updates the last_polled_at timestamp for a tracked story.
+    Sets each polled story's next poll time in one RPC.
     
-    This function is intended to be called after polling for new articles
-    for a story, whether or not new articles were found.
+    Stories that gained articles are polled again after POLLING_INTERVAL minutes;
+    quiet stories double their gap up to POLLING_MAX_INTERVAL minutes.
     
     Args:
-        story_id: The ID of the tracked story
-        
-    Returns:
-        True if successful, False otherwise
+        poll_results: List of {"id": story ID, "new_articles": count} dicts
     """
-    logger.info(f"Updating polling timestamp for story {story_id}")
+    if not poll_results:
+        return
     try:
-        current_time = datetime.datetime.utcnow().isoformat()
-        
-        result = supabase.table("tracked_stories") \
-            .update({"last_polled_at": current_time}) \
-            .eq("id", story_id) \
-            .execute()
-        
-        success = result.data and len(result.data) > 0
-        logger.info(f"Update {'successful' if success else 'failed'}")
-        return success
-    
+        supabase.rpc("record_poll_results", {
+            "p_results": poll_results,
+            "p_min_minutes": Config.POLLING_INTERVAL,
+            "p_max_minutes": Config.POLLING_MAX_INTERVAL
+        }).execute()
     except Exception as e:
-        logger.error(f"Error updating polling timestamp: {str(e)}")
-        return False
+        # The claim already pushed next_poll_at out by the current gap, so the
+        # stories are still polled again later
+        logger.error(f"Error recording poll results: {str(e)}")
 
 def update_polling_stories():
     """
@@ -141,6 +117,8 @@ def update_polling_stories():
     This function is similar to update_all_tracked_stories() but focuses only
     on stories with polling enabled. It's intended to be called by the
     polling worker to periodically fetch new articles for active stories.
+    Only stories whose next poll is due are polled; the gap between polls
+    adapts to how often each story's keyword produces new articles.
     
     Returns:
         dict: A dictionary containing statistics about the update operation:
@@ -149,34 +127,61 @@ def update_polling_stories():
     """
     logger.info("Starting update of polling-enabled stories")
     try:
-        # Get all stories with polling enabled
-        stories = get_polling_stories()
-        
-        if not stories:
-            logger.info("No polling-enabled stories found")
-            return {"stories_updated": 0, "new_articles": 0}
-        
-        # Update each story
+        # Poll the keywords concurrently; each poll is dominated by network I/O
         stories_updated = 0
         total_new_articles = 0
-        
-        for story in stories:
-            story_id = story["id"]
-            keyword = story["keyword"]
-            logger.debug(f"Polling story {story_id}, keyword: '{keyword}'")
-            
-            # Find new articles for this story
-            new_articles = find_related_articles(story_id, keyword)
-            
-            # Always update the last_polled_at timestamp, even if no new articles were found
-            update_polling_timestamp(story_id)
-            
-            if new_articles > 0:
-                stories_updated += 1
-                total_new_articles += new_articles
-                logger.debug(f"Added {new_articles} new articles to story {story_id}")
-            else:
-                logger.debug(f"No new articles found for story {story_id}")
+        poll_results = []
+        
+        try:
+            with ThreadPoolExecutor(max_workers=Config.POLLING_CONCURRENCY) as executor:
+                # Claim due stories batch by batch. Each claim marks its stories as polled
+                # and returns them in one round trip, so no separate timestamp update is
+                # needed, and the next batch is claimed while the previous one is polled.
+                # Each future maps to the keyword it polls, for error reporting
+                futures = {}
+                while True:
+                    result = supabase.rpc("claim_polling_batch", {
+                        "p_batch_size": POLLING_BATCH_SIZE
+                    }).execute()
+                    batch = result.data or []
+                    if not batch:
+                        break
+                    logger.debug("Claimed %d stories for polling", len(batch))
+                    
+                    # Stories tracking the same keyword share a single news fetch
+                    stories_by_keyword = defaultdict(list)
+                    for story in batch:
+                        stories_by_keyword[story["keyword"]].append(story["id"])
+                    for keyword, story_ids in stories_by_keyword.items():
+                        futures[executor.submit(_poll_keyword, keyword, story_ids)] = keyword
+                    
+                    if len(batch) < POLLING_BATCH_SIZE:
+                        break
+                
+                if not futures:
+                    logger.info("No polling-enabled stories are due")
+                    return {"stories_updated": 0, "new_articles": 0}
+                
+                for future in as_completed(futures):
+                    # One keyword's news or database failure must not discard the
+                    # results of the others; its stories keep the next_poll_at set
+                    # by the claim and are retried after their current gap
+                    try:
+                        counts = future.result()
+                    except Exception as e:
+                        logger.error(f"Error polling keyword '{futures[future]}': {str(e)}")
+                        continue
+                    for story_id, new_articles in counts.items():
+                        poll_results.append({"id": story_id, "new_articles": new_articles})
+                        if new_articles > 0:
+                            stories_updated += 1
+                            total_new_articles += new_articles
+                            logger.debug("Added %d new articles to story %s", new_articles, story_id)
+                        else:
+                            logger.debug("No new articles found for story %s", story_id)
+        finally:
+            # Schedule each polled story's next poll from what this one found
+            _record_poll_results(poll_results)
         
         logger.info(f"Update complete. Updated {stories_updated} stories with {total_new_articles} new articles")
         return {
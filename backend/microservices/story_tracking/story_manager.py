@@ -11,12 +11,14 @@ This module provides functionality for managing tracked stories, including:
 It integrates with Supabase for data persistence and handles the core story management operations.
 """
 
-import datetime
 import logging
-from backend.microservices.story_tracking.article_retriever import get_story_articles, get_articles_for_stories
-from backend.microservices.story_tracking.article_matcher import find_related_articles
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from backend.microservices.story_tracking.article_retriever import get_story_articles, STORY_ARTICLE_FIELDS
+from backend.microservices.story_tracking.article_matcher import find_related_articles_batch, schedule_related_articles
 
-# Import centralized Supabase client
+# Import centralized Supabase client and configuration
+from backend.core.config import Config
 from backend.core.supabase_client import supabase
 
 # Initialize logger
@@ -25,6 +27,20 @@ logger.setLevel(logging.INFO)
 
 logger.info("Story Manager Service initialized with Supabase configuration")
 
+# Number of tracked stories read per query when walking the whole table
+TRACKED_STORY_PAGE_SIZE = 500
+
+# Story columns returned to clients; the polling schedule (next_poll_at, poll_gap) stays internal
+TRACKED_STORY_FIELDS = "id, user_id, keyword, created_at, last_updated, is_polling, last_polled_at"
+
+def project_story_fields(story):
+    """
+    Returns only the TRACKED_STORY_FIELDS columns of a full tracked story record,
+    such as the rows returned by an UPDATE or by create_tracked_story_with_source,
+    so every endpoint returns stories in the same shape as a read.
+    """
+    return {field: story[field] for field in TRACKED_STORY_FIELDS.split(", ") if field in story}
+
 def create_tracked_story(user_id, keyword, source_article_id=None, enable_polling=False):
     """
     Creates a new tracked story for a user based on a keyword.
@@ -41,50 +57,38 @@ def create_tracked_story(user_id, keyword, source_article_id=None, enable_pollin
     
     logger.info(f"Creating tracked story for user {user_id}, keyword: '{keyword}', source_article: {source_article_id}, polling: {enable_polling}")
     try:
-        # Check if the user is already tracking this keyword
-        logger.debug(f"Checking if user already tracks keyword '{keyword}'")
-        existing = supabase.table("tracked_stories") \
-            .select("*") \
-            .eq("user_id", user_id) \
-            .eq("keyword", keyword) \
-            .execute()
-            
-        if existing.data and len(existing.data) > 0:
-            # User is already tracking this keyword
-            logger.info(f"User already tracking this keyword, found {len(existing.data)} existing entries")
-            return existing.data[0]
-        
-        # Create a new tracked story
+        # Create the story and link the source article in a single transaction; the
+        # unique (user_id, keyword) index turns a duplicate into a no-op instead of a second row
         logger.debug("Creating new tracked story record")
-        current_time = datetime.datetime.utcnow().isoformat()
-        result = supabase.table("tracked_stories").insert({
-            "user_id": user_id,
-            "keyword": keyword,
-            "created_at": current_time,
-            "last_updated": current_time,
-            "is_polling": enable_polling,
-            "last_polled_at": current_time if enable_polling else None
+        result = supabase.rpc("create_tracked_story_with_source", {
+            "p_user": user_id,
+            "p_keyword": keyword,
+            "p_source": source_article_id,
+            "p_polling": enable_polling
         }).execute()
         
         if not result.data:
             logger.error(f"Failed to create tracked story: {result}")
             return None
-            
-        tracked_story = result.data[0] if result.data else None
-        logger.info(f"Tracked story created with ID: {tracked_story['id'] if tracked_story else None}")
-        
-        # If a source article was provided, link it to the tracked story
-        if tracked_story and source_article_id:
-            logger.debug(f"Linking source article {source_article_id} to tracked story")
-            supabase.table("tracked_story_articles").insert({
-                "tracked_story_id": tracked_story["id"],
-                "news_id": source_article_id,
-                "added_at": datetime.datetime.utcnow().isoformat()
-            }).execute()
-        
-        # Log that we're skipping synchronous article fetching
-        logger.debug("Skipping synchronous article fetching to avoid resource contention")
-        find_related_articles(tracked_story["id"], keyword)
+        
+        tracked_story = project_story_fields(result.data["story"])
+        if not result.data["created"]:
+            # User is already tracking this keyword
+            logger.info(f"User already tracking keyword '{keyword}'")
+            return tracked_story
+        
+        logger.info(f"Tracked story created with ID: {tracked_story['id']}")
+        if source_article_id:
+            logger.debug(f"Linked source article {source_article_id} to tracked story")
+        
+        # Fetch related articles in the background rather than blocking the request.
+        # A story created with polling enabled has no next_poll_at yet, so the polling
+        # worker's next cycle fetches for it and a second fetch here would be redundant.
+        if enable_polling:
+            logger.debug("Leaving the initial article fetch to the polling worker")
+        else:
+            logger.debug("Skipping synchronous article fetching to avoid resource contention")
+            schedule_related_articles(tracked_story["id"], keyword, force=True)
         
         return tracked_story
     
@@ -92,6 +96,27 @@ def create_tracked_story(user_id, keyword, source_article_id=None, enable_pollin
         logger.error(f"Error creating tracked story: {str(e)}")
         raise e
 
+def _story_with_articles_select(article_fields):
+    """
+    Builds a select that embeds a story's linked articles, with the given article
+    columns, through the tracked_story_articles foreign keys.
+    """
+    return f"{TRACKED_STORY_FIELDS}, tracked_story_articles(added_at, news_articles({','.join(article_fields)}))"
+
+def _flatten_story_articles(story):
+    """
+    Replaces a story's embedded tracked_story_articles rows with a flat, newest-first
+    "articles" list, each article carrying the added_at of its link.
+    """
+    links = story.pop("tracked_story_articles", None) or []
+    links.sort(key=lambda link: link["added_at"], reverse=True)
+    story["articles"] = [
+        {**link["news_articles"], "added_at": link["added_at"]}
+        for link in links
+        if link.get("news_articles")
+    ]
+    return story
+
 def get_tracked_stories(user_id):
     """
     Gets all tracked stories for a user.
@@ -104,9 +129,11 @@ def get_tracked_stories(user_id):
     """
     logger.info(f"Getting tracked stories for user {user_id}")
     try:
-        # Get all tracked stories for the user
+        # Get all tracked stories for the user together with their linked articles,
+        # embedded through the tracked_story_articles foreign keys in a single query;
+        # the list view only needs the article columns in STORY_ARTICLE_FIELDS
         result = supabase.table("tracked_stories") \
-            .select("*") \
+            .select(_story_with_articles_select(STORY_ARTICLE_FIELDS)) \
             .eq("user_id", user_id) \
             .order("created_at", desc=True) \
             .execute()
@@ -114,18 +141,10 @@ def get_tracked_stories(user_id):
         tracked_stories = result.data if result.data else []
         logger.info(f"Found {len(tracked_stories)} tracked stories")
 
-        if not tracked_stories:
-            return tracked_stories
-
-        # Batch fetch all articles for all stories in one operation
-        story_ids = [story["id"] for story in tracked_stories]
-        logger.debug(f"Fetching articles for {len(story_ids)} stories")
-        articles_by_story = get_articles_for_stories(story_ids)
-
-        # Add articles to each story
+        # Flatten the embedded join rows into each story's article list, newest first
         for story in tracked_stories:
-            story["articles"] = articles_by_story.get(story["id"], [])
-            logger.debug(f"Found {len(story['articles'])} articles for story {story['id']}")
+            _flatten_story_articles(story)
+            logger.debug("Found %d articles for story %s", len(story["articles"]), story["id"])
 
         return tracked_stories
     
@@ -133,22 +152,30 @@ def get_tracked_stories(user_id):
         logger.error(f"Error getting tracked stories: {str(e)}")
         raise e
 
-def get_story_details(story_id, user_id=None):
+def get_story_details(story_id, user_id=None, *, story=None):
     """
     Gets details for a specific tracked story including related articles.
 
     Args:
         story_id: The ID of the tracked story
         user_id: Optional user ID to filter by owner
+        story: Optional tracked story record the caller already holds; when given,
+            the story is not read again and only its articles are fetched
 
     Returns:
         The tracked story with its related articles, or None if not found or not owned by user
     """
     logger.info(f"Getting story details for story ID {story_id}" + (f" for user {user_id}" if user_id else ""))
     try:
-        # Get the tracked story
+        if story is not None:
+            # Copy the caller's record rather than adding articles to it in place
+            story = {**story, "articles": get_story_articles(story_id, fields=("*",))}
+            logger.info(f"Found {len(story['articles'])} related articles")
+            return story
+        
+        # Get the tracked story with its articles embedded, in a single query
         query = supabase.table("tracked_stories") \
-            .select("*") \
+            .select(_story_with_articles_select(("*",))) \
             .eq("id", story_id)
 
         if user_id:
@@ -156,16 +183,12 @@ def get_story_details(story_id, user_id=None):
 
         result = query.execute()
         
-        if not result.data or len(result.data) == 0:
+        if not result.data:
             logger.warning(f"No story found with ID {story_id}")
             return None
         
-        story = result.data[0]
+        story = _flatten_story_articles(result.data[0])
         logger.debug(f"Found story: {story['keyword']}")
-        
-        # Get related articles
-        logger.debug("Getting related articles")
-        story["articles"] = get_story_articles(story_id)
         logger.info(f"Found {len(story['articles'])} related articles")
         
         return story
@@ -194,7 +217,7 @@ def delete_tracked_story(user_id, story_id):
             .eq("user_id", user_id) \
             .execute()
         
-        success = len(result.data) > 0
+        success = bool(result.data)
         logger.info(f"Delete operation {'successful' if success else 'failed'}")
         return success
     
@@ -202,13 +225,48 @@ def delete_tracked_story(user_id, story_id):
         logger.error(f"Error deleting tracked story: {str(e)}")
         raise e
 
+def iter_tracked_stories(columns="*", page_size=TRACKED_STORY_PAGE_SIZE):
+    """
+    Yields tracked stories one page at a time using keyset pagination on id.
+    
+    Each page is fetched only when the previous one has been consumed, so callers
+    can start working on the first page while the table is still being read, and
+    never hold more than one page of rows from the query at once.
+    
+    Args:
+        columns: The columns to select; must include id
+        page_size: Maximum number of stories per page
+        
+    Yields:
+        list: A page of tracked story records, ordered by id
+    """
+    cursor = None
+    while True:
+        query = supabase.table("tracked_stories") \
+            .select(columns) \
+            .order("id") \
+            .limit(page_size)
+        if cursor:
+            query = query.gt("id", cursor)
+        
+        rows = query.execute().data or []
+        if not rows:
+            return
+        logger.debug("Fetched page of %d tracked stories", len(rows))
+        yield rows
+        
+        if len(rows) < page_size:
+            return
+        cursor = rows[-1]["id"]
+
 def update_all_tracked_stories():
     """
     Background job to update all tracked stories with new related articles.
     
     This function is designed to be run as a scheduled task to keep all tracked stories
     up-to-date with the latest news articles. It iterates through all tracked stories in the
-    database and calls find_related_articles() for each one to fetch and link new articles.
+    database, groups them by keyword and calls find_related_articles_batch() once per keyword
+    to fetch and link new articles, running up to POLLING_CONCURRENCY keywords at a time.
     
     Returns:
         dict: A dictionary containing statistics about the update operation:
@@ -217,30 +275,37 @@ def update_all_tracked_stories():
     """
     logger.info("Starting update of all tracked stories")
     try:
-        # Get all tracked stories
-        result = supabase.table("tracked_stories") \
-            .select("id, keyword") \
-            .execute()
-        
-        tracked_stories = result.data if result.data else []
-        logger.info(f"Found {len(tracked_stories)} tracked stories to update")
+        # Group every story by keyword before fetching anything, so stories tracking the
+        # same keyword share a single news fetch even when they sit on different pages.
+        # Only id and keyword are read, so the whole table stays small in memory.
+        stories_by_keyword = defaultdict(list)
+        story_count = 0
+        for page in iter_tracked_stories(columns="id, keyword"):
+            story_count += len(page)
+            for story in page:
+                stories_by_keyword[story["keyword"]].append(story["id"])
         
-        if not tracked_stories:
+        logger.info(f"Found {story_count} tracked stories ({len(stories_by_keyword)} distinct keywords) to update")
+        if not stories_by_keyword:
             return {"stories_updated": 0, "new_articles": 0}
         
-        # Update each tracked story
+        # Update the keywords concurrently; each update is dominated by network I/O
         stories_updated = 0
         total_new_articles = 0
         
-        for story in tracked_stories:
-            logger.debug(f"Updating story {story['id']}, keyword: '{story['keyword']}'")
-            new_articles = find_related_articles(story["id"], story["keyword"])
-            if new_articles > 0:
-                stories_updated += 1
-                total_new_articles += new_articles
-                logger.debug(f"Added {new_articles} new articles to story {story['id']}")
-            else:
-                logger.debug(f"No new articles found for story {story['id']}")
+        with ThreadPoolExecutor(max_workers=min(Config.POLLING_CONCURRENCY, len(stories_by_keyword))) as executor:
+            futures = [
+                executor.submit(find_related_articles_batch, story_ids, keyword)
+                for keyword, story_ids in stories_by_keyword.items()
+            ]
+            for future in as_completed(futures):
+                for story_id, new_articles in future.result().items():
+                    if new_articles > 0:
+                        stories_updated += 1
+                        total_new_articles += new_articles
+                        logger.debug("Added %d new articles to story %s", new_articles, story_id)
+                    else:
+                        logger.debug("No new articles found for story %s", story_id)
         
         logger.info(f"Update complete. Updated {stories_updated} stories with {total_new_articles} new articles")
         return {
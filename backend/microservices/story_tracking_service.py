@@ -25,18 +25,18 @@ Environment Variables Required:
 - SUPABASE_SERVICE_ROLE_KEY: Service role key for admin access
 """
 
-#TODO: Implement proper background processing: Use a task queue like Celery to handle article fetching in the background
+#TODO: Article fetches for new stories run on an in-process, keyword-debounced background pool
+#      (see article_matcher.schedule_related_articles); move them to a durable task queue like
+#      Celery so pending fetches survive a restart
 
 # from summarization.story_tracking.story_tracking import cluster_articles
 from backend.microservices.news_fetcher import fetch_news
-from backend.core.utils import setup_logger
+from backend.core.utils import setup_logger, configure_logging
 
 # Import the refactored modules
-from backend.microservices.story_tracking.article_matcher import find_related_articles
+from backend.microservices.story_tracking.article_matcher import find_related_articles, find_related_articles_batch
 from backend.microservices.story_tracking.polling_service import (
     toggle_polling,
-    get_polling_stories,
-    update_polling_timestamp,
     update_polling_stories
 )
 from backend.microservices.story_tracking.story_manager import (
@@ -79,6 +79,7 @@ def run_story_tracking(article_embeddings):
 
 if __name__ == '__main__':
     # Example usage - this code runs when the script is executed directly
+    configure_logging()
     logger.info("Running story_tracking_service.py as main")
     result = update_all_tracked_stories()
     logger.info(f"Updated {result['stories_updated']} stories with {result['new_articles']} new articles")
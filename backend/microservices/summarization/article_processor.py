@@ -12,33 +12,115 @@ It integrates with Supabase for data persistence and Google Gemini API for text
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from backend.core.config import Config
 from backend.core.utils import setup_logger, log_exception
 from backend.microservices.summarization.content_fetcher import fetch_article_content
 from backend.microservices.summarization.keyword_extractor import get_keywords
+from backend.microservices.storage.bookmark_service import get_bookmark_ids
 
 # Import the summarization function from the utilities module
 # This avoids circular imports while maintaining functionality
-from backend.microservices.summarization.summarization_utils import run_summarization
+from backend.microservices.summarization.summarization_utils import run_summarization, SUMMARY_ERROR
 
 # Import centralized Supabase client
-from backend.core.supabase_client import supabase
+from backend.core.supabase_client import supabase, select_in_chunks
 
 # Initialize logger
 logger = setup_logger(__name__)
 
 logger.info("Article Processor Service initialized with Supabase configuration")
 
+# Maximum number of article pages fetched at the same time; summarization runs in a
+# separate pool sized by Config.GEMINI_MAX_CONCURRENCY
+MAX_FETCH_WORKERS = 16
+
+# news_articles columns read by _process_article
+PROCESS_ARTICLE_FIELDS = "id, title, author, source, published_at, url, image, content, filter_keywords, generated_summary"
+
+def _fetch_content(article):
+    """
+    Returns the text to summarize for one article, fetching it from the article's URL
+    when the record has no content.
+    
+    Articles that already have a stored summary need no text, so nothing is fetched
+    for them and None is returned.
+    """
+    if article.get('generated_summary') is not None:
+        return None
+    
+    content = article.get('content')
+    if not content:
+        logger.debug(f"No content found for article, fetching from URL: {article['url']}")
+        content = fetch_article_content(article['url'])
+    return content
+
+def _process_article(article, content):
+    """
+    Summarizes one article and extracts its keywords.
+    
+    The summary and keywords depend only on the article content, so values stored on
+    the article by an earlier run are reused instead of being generated again.
+    
+    Args:
+        article (dict): The news_articles record, with bookmarked_id attached.
+        content (str): The text to summarize, as returned by _fetch_content().
+    
+    Returns:
+        tuple: The processed article data, and a dict of newly generated fields to
+               store on the article (empty when nothing new was generated).
+    """
+    logger.info(f"Processing article: {article['title']}")
+    new_fields = {}
+    
+    summary = article.get('generated_summary')
+    if summary is None:
+        if content:
+            logger.debug("Generating summary from fetched content")
+            summary = run_summarization(content)
+            if summary != SUMMARY_ERROR:
+                new_fields['generated_summary'] = summary
+        else:
+            logger.debug("No content to summarize")
+            summary = SUMMARY_ERROR
+    
+    filter_keywords = article.get('filter_keywords')
+    if filter_keywords is None:
+        logger.debug("Extracting keywords for filtering")
+        filter_keywords = get_keywords(article.get('content', ''))
+        new_fields['filter_keywords'] = filter_keywords
+    
+    processed = {
+        'id': article['id'],
+        'title': article['title'],
+        'author': article.get('author', 'Unknown Author'),
+        'source': article.get('source'),
+        'publishedAt': article.get('published_at'),
+        'url': article['url'],
+        'urlToImage': article.get('image'),
+        'content': article.get('content', ''),
+        'summary': summary,
+        'filter_keywords': filter_keywords,
+        'bookmarked_id': article.get('bookmarked_id', None)
+    }
+    return processed, new_fields
+
 @log_exception(logger)
 def process_articles(article_ids, user_id):
     """
     Processes a batch of articles associated with a specific session ID.
     
     This function performs the following operations:
-    1. Retrieves articles from Supabase based on the session ID.
+    1. Retrieves articles and the user's bookmarks from Supabase concurrently.
     2. Fetches missing content for articles if needed.
     3. Generates summaries for each article.
     4. Extracts keywords for filtering.
     
+    Steps 2 and 3-4 form a pipeline: pages are fetched by up to MAX_FETCH_WORKERS
+    threads, and each article is handed to the summarization pool as soon as its
+    content is ready. Both are skipped for summaries and keywords already stored on
+    the article; newly generated ones are saved back to news_articles in one batch.
+    
     Args:
         article_ids (list): A list of article IDs to process.
         user_id (str): The ID of the user for bookmark checking.
@@ -47,26 +129,21 @@ def process_articles(article_ids, user_id):
         list: A list of dictionaries containing processed article data.
     """
     try:
-        articles = []
-
-        # Step 1: Fetch the news_ids from user_bookmarks for the given user_id
-        logger.debug(f"Fetching bookmarks for user {user_id}")
-        bookmark_result = supabase.table("user_bookmarks").select("id, news_id").eq("user_id", user_id).execute()
-
-        bookmark_records = {}
-        if bookmark_result.data:
-            bookmark_records = {item["news_id"]: item["id"] for item in bookmark_result.data}
-
-        bookmarked_news_ids = set(item["news_id"] for item in bookmark_result.data) if bookmark_result.data else set()
-
-        logger.debug(f"Bookmarked news IDs: {bookmarked_news_ids}")
-        logger.debug(f"Article IDs to process: {article_ids}")
-
-        # Step 2: Fetch all articles from news_articles using the article_ids
-        if article_ids:  # Assuming article_ids is defined or fetched earlier
-            logger.debug(f"Fetching {len(article_ids)} articles from database")
-            result = supabase.table("news_articles").select("*").in_("id", article_ids).execute()
-            articles = result.data
+        if not article_ids:
+            return []
+
+        # Steps 1 and 2: fetch the user's bookmarks (usually served from the cache) and
+        # the articles; the two lookups are independent, so run them side by side
+        logger.debug(f"Fetching bookmarks for user {user_id} and {len(article_ids)} articles from database")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            bookmark_future = executor.submit(get_bookmark_ids, user_id)
+            articles_future = executor.submit(
+                select_in_chunks, "news_articles", PROCESS_ARTICLE_FIELDS, "id", article_ids
+            )
+            bookmark_records = bookmark_future.result()
+            articles = articles_future.result()
+
+        logger.debug(f"Bookmarked news IDs: {set(bookmark_records)}")
 
         # Step 3: Add the 'bookmarked' key to each article
         logger.debug(f"Adding bookmark information to {len(articles)} articles")
@@ -74,41 +151,42 @@ def process_articles(article_ids, user_id):
             article["bookmarked_id"] = bookmark_records.get(article["id"], None)
       
         logger.debug(f"Retrieved {len(articles)} articles for processing")
-
-        summarized_articles = []
-        for article in articles:
-            logger.info(f"Processing article: {article['title']}")
-            
-            content = article.get('content')
-            if not content:
-                logger.debug(f"No content found for article, fetching from URL: {article['url']}")
-                content = fetch_article_content(article['url'])
-            
-            if content:
-                logger.debug("Generating summary from fetched content")
-                summary = run_summarization(content)
-            else:
-                logger.debug("Generating summary from existing content")
-                summary = run_summarization(article.get('content', ''))
-            
-            logger.debug("Extracting keywords for filtering")
-            summarized_articles.append({
-                'id': article['id'],
-                'title': article['title'],
-                'author': article.get('author', 'Unknown Author'),
-                'source': article.get('source'),
-                'publishedAt': article.get('published_at'),
-                'url': article['url'],
-                'urlToImage': article.get('image'),
-                'content': article.get('content', ''),
-                'summary': summary,
-                'filter_keywords': get_keywords(article.get('content', '')),
-                'bookmarked_id': article.get('bookmarked_id', None)
-            })
+        if not articles:
+            return []
+
+        # Fetching (bound by the news sites) and summarization (bound by Gemini) run in
+        # separate pools, so pages keep downloading while earlier articles are summarized
+        summary_futures = [None] * len(articles)
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(articles))) as fetch_pool, \
+                ThreadPoolExecutor(max_workers=min(Config.GEMINI_MAX_CONCURRENCY, len(articles))) as summary_pool:
+            fetch_futures = {
+                fetch_pool.submit(_fetch_content, article): index
+                for index, article in enumerate(articles)
+            }
+            for future in as_completed(fetch_futures):
+                index = fetch_futures[future]
+                summary_futures[index] = summary_pool.submit(_process_article, articles[index], future.result())
+            # Collect in the original article order
+            results = [future.result() for future in summary_futures]
+        summarized_articles = [processed for processed, _ in results]
+
+        # Store newly generated summaries and keywords for the whole batch in a single call
+        updates = [
+            {"id": processed["id"], **new_fields}
+            for processed, new_fields in results
+            if new_fields
+        ]
+        if updates:
+            try:
+                supabase.rpc("store_processed_articles", {"p_articles": updates}).execute()
+                logger.debug(f"Stored summaries and keywords for {len(updates)} articles")
+            except Exception as e:
+                # Not fatal: they are simply generated again next time
+                logger.warning(f"Error storing processed articles: {str(e)}")
 
         logger.info(f"Successfully processed {len(summarized_articles)} articles")
         return summarized_articles
 
     except Exception as e:
         logger.error(f"Error processing articles: {str(e)}")
-        raise e
\ No newline at end of file
+        raise e
@@ -6,12 +6,23 @@ This module provides functionality for extracting keywords from text content usi
 It helps identify key topics and themes in article content for better categorization and filtering.
 """
 
+from functools import lru_cache
 import yake
 from backend.core.utils import setup_logger, log_exception
 
 # Initialize logger
 logger = setup_logger(__name__)
 
+@lru_cache(maxsize=8)
+def _get_extractor(top, lan='en'):
+    """
+    Returns a shared YAKE extractor for the given settings.
+
+    Building an extractor loads the stopword list, so it is done once per
+    (top, lan) combination instead of once per article.
+    """
+    return yake.KeywordExtractor(top=top, lan=lan)
+
 @log_exception(logger)
 def get_keywords(text, num_keywords=1):
     """
@@ -24,6 +35,6 @@ def get_keywords(text, num_keywords=1):
     Returns:
         list: A list of extracted keywords/key phrases.
     """
-    kw_extractor = yake.KeywordExtractor(top=num_keywords, lan='en')
+    kw_extractor = _get_extractor(num_keywords, 'en')
     keywords = kw_extractor.extract_keywords(text)
     return [kw[0] for kw in keywords]
\ No newline at end of file
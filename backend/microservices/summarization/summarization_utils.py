@@ -7,19 +7,152 @@ without creating circular dependencies.
 
 Key Features:
 - Text summarization using Google Gemini API
+- Summaries cached in Redis by a hash of the input text, so identical content
+  (the same article, or a wire story republished by several outlets) is summarized once
 """
 
-from google import genai
-from google.genai import types
+import hashlib
+import threading
+import time
+from functools import lru_cache
 from backend.core.config import Config
+from backend.core.redis_client import cache_get, cache_set
 from backend.core.utils import setup_logger, log_exception
 
 # Initialize logger
 logger = setup_logger(__name__)
 
-# Initialize Gemini client with API key from environment variables
-# Use v1 API (not v1beta) where gemini-1.5-flash is available
-_client = genai.Client(api_key=Config.GEMINI_API_KEY)
+@lru_cache(maxsize=1)
+def _get_client():
+    """
+    Returns the shared Gemini client, creating it on first use.
+
+    The google-genai SDK is imported here rather than at module load, so processes
+    that import this module without summarizing anything never pay for it.
+    """
+    from google import genai
+    from google.genai import types
+
+    # Initialize Gemini client with API key from environment variables
+    # Rate-limit and transient server errors are retried by the SDK with exponential
+    # backoff and jitter; the timeout (in milliseconds) bounds each attempt
+    return genai.Client(
+        api_key=Config.GEMINI_API_KEY,
+        http_options=types.HttpOptions(
+            timeout=30000,
+            retry_options=types.HttpRetryOptions(
+                attempts=3,
+                initial_delay=1.0,
+                max_delay=10.0,
+                http_status_codes=[429, 500, 502, 503, 504]
+            )
+        )
+    )
+
+# Bounds in-flight Gemini calls across all requests and worker threads, so concurrent
+# article processing does not burst past the API's request rate
+_gemini_slots = threading.BoundedSemaphore(Config.GEMINI_MAX_CONCURRENCY)
+
+class _RateLimiter:
+    """
+    Thread-safe token bucket refilled continuously at a per-minute rate.
+
+    The bucket holds at most one minute's worth of capacity; acquire() blocks until
+    the requested amount is available.
+    """
+
+    def __init__(self, rate_per_minute):
+        self._rate = rate_per_minute / 60.0
+        self._capacity = float(rate_per_minute)
+        self._available = self._capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount=1):
+        # A single request larger than the bucket would otherwise wait forever
+        amount = min(amount, self._capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._available = min(self._capacity, self._available + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._available >= amount:
+                    self._available -= amount
+                    return
+                wait = (amount - self._available) / self._rate
+            time.sleep(wait)
+
+# Keep request and token throughput within the Gemini quota, so bursts are spread
+# out here instead of being rejected with 429s and retried
+_request_limiter = _RateLimiter(Config.GEMINI_RPM)
+_token_limiter = _RateLimiter(Config.GEMINI_TPM)
+
+# Output tokens reserved per call, matching max_output_tokens
+_OUTPUT_TOKENS = 200
+
+# Input sent for summarization is capped at about MAX_INPUT_TOKENS tokens; English
+# prose averages about four characters per Gemini token
+MAX_INPUT_TOKENS = 3000
+_CHARS_PER_TOKEN = 4
+
+def _truncate_input(text):
+    """Cuts text to the input budget, at the last word boundary within it."""
+    max_chars = MAX_INPUT_TOKENS * _CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(' ', 0, max_chars)
+    return text[:cut if cut > 0 else max_chars]
+
+# Returned when summarization fails; never cached
+SUMMARY_ERROR = "Error generating summary"
+
+def _summary_cache_key(text):
+    """Returns the cache key for the summary of a text, derived from a hash of its content."""
+    return f"summary:{hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()}"
+
+# Fixed part of the summarization prompt; the text to summarize is appended to it
+_PROMPT_PREFIX = """You are a helpful assistant that summarizes text in approximately 150 words.
+
+Please summarize the following text:
+
+"""
+
+@lru_cache(maxsize=1)
+def _generation_config():
+    """Returns the generation settings shared by every summarization call."""
+    from google.genai import types
+
+    return types.GenerateContentConfig(
+        temperature=0.5,
+        max_output_tokens=_OUTPUT_TOKENS
+    )
+
+def _generate_summary(model, text):
+    """Calls a Gemini model to summarize text, within the rate and concurrency limits."""
+    # Wait for quota before taking a concurrency slot; input tokens are estimated
+    # at about four characters each
+    _request_limiter.acquire()
+    _token_limiter.acquire(len(text) // _CHARS_PER_TOKEN + _OUTPUT_TOKENS)
+
+    logger.info(f"[SUMMARIZATION DEBUG] Calling {model} model...")
+    with _gemini_slots:
+        response = _get_client().models.generate_content(
+            model=model,
+            contents=_PROMPT_PREFIX + text,
+            config=_generation_config()
+        )
+    logger.info(f"[SUMMARIZATION DEBUG] API call succeeded. Response type: {type(response)}")
+    # text is None when the response was blocked or empty
+    return (response.text or "").strip()
+
+def _needs_escalation(summary, text):
+    """
+    Returns True when a summary from the default model looks unusable: empty, a
+    refusal, or far shorter than the target for a text long enough to support it.
+    """
+    if not summary or summary.startswith(("I ", "I'm", "Sorry")):
+        return True
+    return len(summary.split()) < 80 and len(text.split()) > 300
 
 @log_exception(logger)
 def run_summarization(text):
@@ -31,38 +164,47 @@ def run_summarization(text):
 
     Returns:
         str: A summarized version of the input text (approximately 150 words).
-             Returns an error message if summarization fails.
+             Returns an error message if the text is empty or summarization fails.
 
     Note:
-        Uses Google Gemini's gemini-1.5-flash model (fastest) with specific parameters:
+        Uses Config.GEMINI_MODEL (gemini-2.0-flash-lite by default), retrying with
+        Config.GEMINI_ESCALATION_MODEL when the summary is empty, a refusal or much
+        too short, with specific parameters:
         - Temperature: 0.5
         - Max output tokens: 200
     """
+    # Nothing to summarize; don't spend a request on it or cache the reply
+    if not text or not text.strip():
+        return SUMMARY_ERROR
+
     try:
+        # Texts that agree up to the budget get the same input, and so share a cached summary
+        text = _truncate_input(text)
+        cache_key = _summary_cache_key(text)
+        cached = cache_get(cache_key)
+        if cached is not None:
+            logger.debug(f"Using cached summary for text of length {len(text)}")
+            return cached
+
         logger.info(f"[SUMMARIZATION DEBUG] Starting summarization. Text length: {len(text)}")
-        logger.info(f"[SUMMARIZATION DEBUG] Client type: {type(_client)}")
         logger.info(f"[SUMMARIZATION DEBUG] Client API key set: {'***' if Config.GEMINI_API_KEY else 'NOT SET'}")
 
-        logger.info(f"[SUMMARIZATION DEBUG] Calling gemini-1.5-flash model...")
-        response = _client.models.generate_content(
-            model='gemini-2.0-flash-lite',
-            contents=f"""You are a helpful assistant that summarizes text in approximately 150 words.
+        # Summarize with the cheaper default model, escalating to the stronger one only
+        # when the result fails the quality check
+        summary = _generate_summary(Config.GEMINI_MODEL, text)
+        if _needs_escalation(summary, text):
+            logger.info(f"Escalating summarization from {Config.GEMINI_MODEL} to {Config.GEMINI_ESCALATION_MODEL}")
+            summary = _generate_summary(Config.GEMINI_ESCALATION_MODEL, text) or summary
+        if not summary:
+            return SUMMARY_ERROR
 
-Please summarize the following text:
-
-{text}""",
-            config=types.GenerateContentConfig(
-                temperature=0.5,
-                max_output_tokens=200
-            )
-        )
-        logger.info(f"[SUMMARIZATION DEBUG] API call succeeded. Response type: {type(response)}")
-        logger.info(f"[SUMMARIZATION DEBUG] Response text length: {len(response.text)}")
-        return response.text.strip()
+        logger.info(f"[SUMMARIZATION DEBUG] Response text length: {len(summary)}")
+        cache_set(cache_key, summary, ttl=Config.SUMMARY_CACHE_TTL)
+        return summary
     except Exception as e:
         logger.error(f"[SUMMARIZATION ERROR] Full exception type: {type(e).__name__}")
         logger.error(f"[SUMMARIZATION ERROR] Full exception: {str(e)}")
         logger.error(f"[SUMMARIZATION ERROR] Exception repr: {repr(e)}")
         import traceback
         logger.error(f"[SUMMARIZATION ERROR] Traceback: {traceback.format_exc()}")
-        return "Error generating summary"
\ No newline at end of file
+        return SUMMARY_ERROR
\ No newline at end of file
@@ -0,0 +1,6 @@
+import os
+
+# The shared Supabase client is created at import time and refuses to start without
+# credentials; tests replace it before any request is made
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test-service-role-key")
@@ -0,0 +1,90 @@
+import datetime
+
+from backend.core.config import Config
+from backend.microservices.story_tracking import article_matcher, polling_service
+
+
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, data):
+        self._data = data
+
+    def select(self, *args, **kwargs):
+        return self
+
+    def in_(self, column, values):
+        self._data = [row for row in self._data if row[column] in values]
+        return self
+
+    def execute(self):
+        return _Result(self._data)
+
+
+class _FakeSupabase:
+    """Answers the calls made by one polling cycle over a fixed set of due stories."""
+
+    def __init__(self, stories):
+        self.stories = stories
+        self.recorded = None
+
+    def rpc(self, name, params):
+        if name == "claim_polling_batch":
+            return _Query([{"id": story["id"], "keyword": story["keyword"]} for story in self.stories])
+        if name == "add_story_links":
+            return _Query([{"story_id": sid, "added": len(params["p_links"])} for sid in params["p_stories"]])
+        if name == "record_poll_results":
+            self.recorded = params["p_results"]
+            return _Query(None)
+        raise AssertionError(f"unexpected rpc {name}")
+
+    def table(self, name):
+        assert name == "tracked_stories"
+        return _Query(self.stories)
+
+
+def _story(story_id, keyword, updated_minutes_ago=60):
+    updated = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(minutes=updated_minutes_ago)
+    return {"id": story_id, "keyword": keyword, "last_updated": updated.isoformat()}
+
+
+def _patch(monkeypatch, fake, fetch_news):
+    monkeypatch.setattr(polling_service, "supabase", fake)
+    monkeypatch.setattr(article_matcher, "supabase", fake)
+    monkeypatch.setattr(article_matcher, "fetch_news", fetch_news)
+    monkeypatch.setattr(article_matcher, "store_articles_in_supabase", lambda articles: [f"article-{a['url']}" for a in articles])
+    monkeypatch.setattr(article_matcher, "invalidate_story_articles", lambda story_id: None)
+
+
+def test_claimed_story_inside_refresh_cooldown_is_still_polled(monkeypatch):
+    # The story gained articles more recently than the refresh cooldown, but the
+    # claim already decided it is due; skipping it would double its polling gap
+    assert Config.STORY_REFRESH_COOLDOWN > 1
+    fake = _FakeSupabase([_story("story-1", "climate", updated_minutes_ago=1)])
+    fetched = []
+    _patch(monkeypatch, fake, lambda keyword: fetched.append(keyword) or [{"url": "a"}])
+
+    stats = polling_service.update_polling_stories()
+
+    assert fetched == ["climate"]
+    assert fake.recorded == [{"id": "story-1", "new_articles": 1}]
+    assert stats == {"stories_updated": 1, "new_articles": 1}
+
+
+def test_failed_keyword_does_not_drop_other_results(monkeypatch):
+    def fetch_news(keyword):
+        if keyword == "broken":
+            raise RuntimeError("news API unavailable")
+        return [{"url": "a"}]
+
+    fake = _FakeSupabase([_story("story-1", "broken"), _story("story-2", "climate")])
+    _patch(monkeypatch, fake, fetch_news)
+
+    stats = polling_service.update_polling_stories()
+
+    # The failed story is left out, keeping the next_poll_at set by its claim
+    assert fake.recorded == [{"id": "story-2", "new_articles": 1}]
+    assert stats == {"stories_updated": 1, "new_articles": 1}